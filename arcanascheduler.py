@@ -3,35 +3,191 @@ from tkinter import ttk, messagebox, filedialog
 import json
 import datetime
 import os
+import io
+import gzip
 import webbrowser
 import sqlite3
-
-# Optional imports for extra features
-try:
-    import matplotlib
-    matplotlib.use('TkAgg')
-    import matplotlib.pyplot as plt
-except ImportError:
-    plt = None
-
-try:
-    # ICS support
-    from icalendar import Calendar, Event
-except ImportError:
-    Calendar = None
-    Event = None
-
-try:
-    # For desktop notifications (Windows/others)
-    from plyer import notification
-except ImportError:
-    notification = None
+import threading
+import contextlib
+import collections
+import importlib.util
+import concurrent.futures
+import itertools
+import functools
+import hashlib
+import queue
+import re
+
+# Optional extras (charts, ICS, desktop notifications) are imported on first
+# use, so start-up doesn't pay for them; find_spec() only checks whether each
+# one is installed, without importing it.
+def _installed(name):
+    return importlib.util.find_spec(name) is not None
+
+
+HAS_MATPLOTLIB = _installed('matplotlib')
+HAS_ICALENDAR = _installed('icalendar')
+HAS_PLYER = _installed('plyer')
+
+
+def load_figure():
+    """
+    matplotlib's Figure class, imported on first call. Figures made from it
+    are not tracked by pyplot, so they are freed along with their canvas.
+    Tk thread only.
+    """
+    from matplotlib.figure import Figure
+    return Figure
 
 
 # =================================================================
 #                          DATA / MODEL
 # =================================================================
 
+# Ordinals used to sort the text-valued task columns by meaning rather than
+# alphabetically; anything else sorts after the known values.
+PRIORITY_ORDER = {'Low': 0, 'Medium': 1, 'High': 2, 'Critical': 3}
+STATUS_ORDER = {'Behind': 0, 'Pending': 1, 'Ahead': 2, 'Completed': 3}
+
+# Sort key for a missing estimate / phase / objective: after every real value
+SORT_LAST = 1 << 62
+
+_DURATION_UNITS = {
+    'w': 7 * 24 * 60, 'wk': 7 * 24 * 60, 'week': 7 * 24 * 60, 'weeks': 7 * 24 * 60,
+    'd': 24 * 60, 'day': 24 * 60, 'days': 24 * 60,
+    'h': 60, 'hr': 60, 'hrs': 60, 'hour': 60, 'hours': 60,
+    'm': 1, 'min': 1, 'mins': 1, 'minute': 1, 'minutes': 1,
+}
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)\s*([a-z]*)')
+
+
+# Imports call this for every row, over a handful of distinct estimates
+@functools.lru_cache(maxsize=1024)
+def parse_duration(text):
+    """
+    Minutes in a free-text estimate such as '2h', '30m', '1h 30m', '1.5 hours'
+    or '2d'; a lone bare number counts as hours. Returns None when the text is empty
+    or not understood.
+    """
+    text = (text or '').strip().lower()
+    if not text:
+        return None
+    total = 0.0
+    pos = 0
+    for m in _DURATION_PART.finditer(text):
+        if text[pos:m.start()].strip(' ,+'):
+            return None
+        # A bare number is hours on its own, minutes after another part ('1h30')
+        unit = _DURATION_UNITS.get(m.group(2) or ('m' if pos else 'h'))
+        if unit is None:
+            return None
+        total += float(m.group(1)) * unit
+        pos = m.end()
+    if pos == 0 or text[pos:].strip(' ,+'):
+        return None
+    return round(total)
+
+
+def _or_last(value):
+    return SORT_LAST if value is None else value
+
+
+class Record(tuple):
+    """
+    Compact, read-only row: a tuple subclass with no per-instance __dict__
+    (`__slots__ = ()`), built straight from a sqlite3 result tuple. It also
+    answers the dict-style access the UI uses (row['title'], row.get(...),
+    keys(), items()), so it can stand in wherever a row dict is only read.
+    Subclasses set `_fields` to the SELECT column order.
+    """
+    __slots__ = ()
+    _fields = ()
+    _index = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._index = {name: i for i, name in enumerate(cls._fields)}
+
+    def __getitem__(self, key):
+        if key.__class__ is str:
+            try:
+                key = self._index[key]
+            except KeyError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def __getattr__(self, name):
+        try:
+            return tuple.__getitem__(self, self._index[name])
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def get(self, key, default=None):
+        i = self._index.get(key)
+        return default if i is None else tuple.__getitem__(self, i)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def keys(self):
+        return self._fields
+
+    def values(self):
+        return tuple(self)
+
+    def items(self):
+        return zip(self._fields, self)
+
+    def to_dict(self):
+        return dict(zip(self._fields, self))
+
+
+class TaskRow(Record):
+    __slots__ = ()
+    _fields = ('id', 'phase_id', 'objective_id', 'title', 'description', 'date', 'status',
+               'recurring', 'priority', 'category', 'estimated_time', 'completion_timestamp')
+
+
+class PhaseRow(Record):
+    __slots__ = ()
+    _fields = ('id', 'phase_number', 'phase_title', 'phase_description')
+
+
+class ObjectiveRow(Record):
+    __slots__ = ()
+    _fields = ('id', 'phase_id', 'objective_name', 'objective_description', 'completion_criteria')
+
+
+class ReflectionRow(Record):
+    __slots__ = ()
+    _fields = ('id', 'timestamp', 'content')
+
+
+class Cancelled(Exception):
+    """Raised inside a long-running job once its CancelToken has been cancelled."""
+
+
+class CancelToken:
+    """
+    Cooperative cancellation flag shared between the Tk thread (which calls
+    cancel()) and a background job (which calls check() at safe points).
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise Cancelled()
+
+
 class ArcanaeumDB:
     """
     The ArcanaeumDB handles creating and managing the underlying SQLite database.
@@ -40,14 +196,150 @@ class ArcanaeumDB:
       - phases       (learning phases, each can have multiple tasks)
       - objectives   (each objective belongs to a phase; tasks can reference an objective)
       - reflections  (daily or ad-hoc reflection logs)
+
+    Read methods return dicts by default; pass compact=True to get Record
+    tuples instead (much smaller and faster to build for large result sets).
+
+    A single long-lived connection is kept per thread (the Tk thread plus any
+    worker thread that touches the DB), tuned with the PRAGMAs in `pragmas`.
+    Call close() when done, or use the DB as a context manager.
     """
 
-    def __init__(self, db_file='arcanaeum.db'):
+    DEFAULT_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,       # negative = KiB, i.e. ~16 MB page cache
+        'mmap_size': 268435456,     # 256 MB
+        'temp_store': 'MEMORY',
+    }
+
+    def __init__(self, db_file='arcanaeum.db', pragmas=None):
         self.db_file = db_file
+        self.pragmas = dict(self.DEFAULT_PRAGMAS)
+        if pragmas:
+            self.pragmas.update(pragmas)
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        # Bumped on every commit (any thread); caches of query results compare
+        # write_version to tell whether they are still current.
+        self._write_counter = itertools.count(1)
+        self._write_version = 0
+        self._stats_cache = None    # (write_version, date, get_statistics() result)
         self._init_db()
 
+    # -----------------------------
+    #       CONNECTION LIFECYCLE
+    # -----------------------------
+    def get_connection(self):
+        """
+        Returns the connection owned by the calling thread, opening and tuning it
+        on first use. Connections stay open until close() is called.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Each connection is only ever used by the thread that opened it;
+            # check_same_thread is off so close() can release all of them.
+            conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            for name, value in self.pragmas.items():
+                if value is not None:
+                    conn.execute(f'PRAGMA {name}={value}')
+            self._local.conn = conn
+            self._local.data_version = self._data_version(conn)
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @property
+    def write_version(self):
+        """
+        Changes whenever the DB may have changed: on every commit made through
+        this object (any thread), and once another connection to the file,
+        e.g. another process, has committed since this thread last looked.
+        """
+        conn = self.get_connection()
+        # PRAGMA data_version only moves for other connections' commits
+        seen = self._data_version(conn)
+        if seen != self._local.data_version:
+            self._local.data_version = seen
+            self._write_version = next(self._write_counter)
+        return self._write_version
+
+    @staticmethod
+    def _data_version(conn):
+        return conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def close(self):
+        """
+        Closes every connection opened by this DB object (on any thread).
+        The object stays usable; the next call simply reconnects.
+        """
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # -----------------------------
+    #         TRANSACTIONS
+    # -----------------------------
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Groups every write made on this thread inside the block into one
+        transaction (one commit, one fsync). Rolls back if the block raises.
+        Blocks may be nested; only the outermost one commits.
+        """
+        conn = self.get_connection()
+        depth = getattr(self._local, 'tx_depth', 0)
+        if depth == 0 and not conn.in_transaction:
+            # Explicit BEGIN so DDL inside the block is covered too
+            # (sqlite3 only opens implicit transactions before DML).
+            conn.execute('BEGIN')
+        self._local.tx_depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.tx_depth = depth
+            if depth == 0:
+                conn.rollback()
+            raise
+        self._local.tx_depth = depth
+        if depth == 0:
+            conn.commit()
+            self._write_version = next(self._write_counter)
+
+    @contextlib.contextmanager
+    def read_transaction(self):
+        """
+        Runs the reads in the block against one consistent snapshot of the DB.
+        Nothing is committed; nested inside transaction() it is a no-op.
+        """
+        conn = self.get_connection()
+        own_transaction = not conn.in_transaction
+        if own_transaction:
+            conn.execute('BEGIN')
+        try:
+            yield conn
+        finally:
+            if own_transaction:
+                conn.rollback()
+
+    def _commit(self, conn):
+        # Inside a transaction() block the outermost block commits instead.
+        if not getattr(self._local, 'tx_depth', 0):
+            conn.commit()
+            self._write_version = next(self._write_counter)
+
     def _init_db(self):
-        conn = sqlite3.connect(self.db_file)
+        conn = self.get_connection()
         c = conn.cursor()
 
         # Create tasks table
@@ -102,8 +394,192 @@ class ArcanaeumDB:
         )
         ''')
 
-        conn.commit()
-        conn.close()
+        self._commit(conn)
+        self._run_migrations(conn)
+
+        self.has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='tasks_fts'"
+        ).fetchone() is not None
+        if not self.has_fts:
+            # Migration 2 ran on an SQLite that could not build the index; try
+            # again, the file may now be opened by one that can.
+            with self.transaction():
+                self.has_fts = self._create_task_search_index(conn.cursor())
+
+    # -----------------------------
+    #         MIGRATIONS
+    # -----------------------------
+    # The base tables above are schema version 0. Every later schema change is a
+    # _migrate_<n>_* method listed in _MIGRATIONS; PRAGMA user_version records how
+    # many have been applied, so existing arcanaeum.db files upgrade in place.
+    # Only ever append to the list.
+    _MIGRATIONS = (
+        '_migrate_1_task_indexes',
+        '_migrate_2_task_search_index',
+        '_migrate_3_task_status_counts',
+        '_migrate_4_task_resources',
+        '_migrate_5_task_estimated_minutes',
+        '_migrate_6_import_keys',
+    )
+
+    SCHEMA_VERSION = len(_MIGRATIONS)
+
+    def _run_migrations(self, conn):
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version > self.SCHEMA_VERSION:
+            raise RuntimeError(
+                f"{self.db_file} has schema version {version}, newer than this "
+                f"application supports ({self.SCHEMA_VERSION})."
+            )
+        for target in range(version + 1, self.SCHEMA_VERSION + 1):
+            migrate = getattr(self, self._MIGRATIONS[target - 1])
+            with self.transaction():
+                migrate(conn.cursor())
+                conn.execute(f'PRAGMA user_version={target}')
+        if version < self.SCHEMA_VERSION:
+            conn.execute('ANALYZE')
+
+    def _migrate_1_task_indexes(self, c):
+        # Filter columns of the main window; each carries `date` so the default
+        # date ordering is served from the index as well.
+        c.execute('CREATE INDEX IF NOT EXISTS idx_tasks_date ON tasks (date)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status_date ON tasks (status, date)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_tasks_phase_date ON tasks (phase_id, date)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_tasks_objective_date ON tasks (objective_id, date)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_tasks_category_date ON tasks (category, date)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_tasks_priority_date ON tasks (priority, date)')
+        # WeeklyReport: completed tasks by completion time
+        c.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status_completed '
+                  'ON tasks (status, completion_timestamp)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_objectives_phase ON objectives (phase_id)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_reflections_timestamp ON reflections (timestamp)')
+
+    def _migrate_2_task_search_index(self, c):
+        self._create_task_search_index(c)
+
+    def _create_task_search_index(self, c):
+        # External-content FTS5 index over tasks; the trigram tokenizer keeps the
+        # search box's case-insensitive substring semantics. Returns whether
+        # the index could be created.
+        try:
+            c.execute('''
+                CREATE VIRTUAL TABLE tasks_fts USING fts5(
+                    title, description,
+                    content='tasks', content_rowid='id', tokenize='trigram'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            # SQLite without FTS5 or older than 3.34 (no trigram tokenizer):
+            # search_tasks()/query_tasks() fall back to LIKE scans.
+            return False
+        # A row in tasks_fts_paused suspends the insert trigger; add_tasks_bulk
+        # uses it (inside its own transaction) to index new rows in one pass.
+        c.execute('CREATE TABLE tasks_fts_paused (paused INTEGER)')
+        c.execute('''
+            CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks
+            WHEN NOT EXISTS (SELECT 1 FROM tasks_fts_paused) BEGIN
+                INSERT INTO tasks_fts (rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+        ''')
+        c.execute('''
+            CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END
+        ''')
+        c.execute('''
+            CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO tasks_fts (rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+        ''')
+        c.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+        return True
+
+    def _migrate_3_task_status_counts(self, c):
+        # Per-status task counts maintained by triggers, so progress/count
+        # queries read a handful of rows instead of scanning tasks.
+        c.execute('''
+            CREATE TABLE task_status_counts (
+                status TEXT PRIMARY KEY,
+                n INTEGER NOT NULL
+            )
+        ''')
+        c.execute('''
+            CREATE TRIGGER task_status_counts_ai AFTER INSERT ON tasks BEGIN
+                INSERT INTO task_status_counts (status, n) VALUES (COALESCE(new.status, ''), 1)
+                ON CONFLICT (status) DO UPDATE SET n = n + 1;
+            END
+        ''')
+        c.execute('''
+            CREATE TRIGGER task_status_counts_ad AFTER DELETE ON tasks BEGIN
+                UPDATE task_status_counts SET n = n - 1 WHERE status = COALESCE(old.status, '');
+            END
+        ''')
+        c.execute('''
+            CREATE TRIGGER task_status_counts_au AFTER UPDATE OF status ON tasks
+            WHEN old.status IS NOT new.status BEGIN
+                UPDATE task_status_counts SET n = n - 1 WHERE status = COALESCE(old.status, '');
+                INSERT INTO task_status_counts (status, n) VALUES (COALESCE(new.status, ''), 1)
+                ON CONFLICT (status) DO UPDATE SET n = n + 1;
+            END
+        ''')
+        c.execute('''
+            INSERT INTO task_status_counts (status, n)
+            SELECT COALESCE(status, ''), COUNT(*) FROM tasks GROUP BY COALESCE(status, '')
+        ''')
+
+    def _migrate_4_task_resources(self, c):
+        # Resources move from a comma-joined tasks.resources string (which split
+        # URLs containing commas) to one row per resource. The old column is
+        # left in place but no longer written.
+        c.execute('''
+            CREATE TABLE task_resources (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                resource TEXT NOT NULL,
+                FOREIGN KEY (task_id) REFERENCES tasks (id)
+            )
+        ''')
+        c.execute('CREATE INDEX idx_task_resources_task ON task_resources (task_id, position)')
+        c.execute('''
+            CREATE TRIGGER task_resources_ad AFTER DELETE ON tasks BEGIN
+                DELETE FROM task_resources WHERE task_id = old.id;
+            END
+        ''')
+        rows = c.execute("SELECT id, resources FROM tasks WHERE resources <> ''").fetchall()
+        c.executemany(
+            'INSERT INTO task_resources (task_id, position, resource) VALUES (?, ?, ?)',
+            ((task_id, pos, res)
+             for task_id, joined in rows
+             for pos, res in enumerate(r for r in joined.split(',') if r))
+        )
+        c.execute('UPDATE tasks SET resources = NULL')
+
+    def _migrate_5_task_estimated_minutes(self, c):
+        # estimated_time is free text ('2h', '30m'); its parsed value in minutes
+        # is stored alongside so estimates sort numerically in SQL.
+        c.execute('ALTER TABLE tasks ADD COLUMN estimated_minutes INTEGER')
+        rows = c.execute("SELECT id, estimated_time FROM tasks WHERE estimated_time <> ''").fetchall()
+        c.executemany(
+            'UPDATE tasks SET estimated_minutes = ? WHERE id = ?',
+            ((minutes, task_id) for task_id, text in rows
+             if (minutes := parse_duration(text)) is not None)
+        )
+        c.execute('CREATE INDEX idx_tasks_estimated ON tasks (estimated_minutes)')
+
+    def _migrate_6_import_keys(self, c):
+        # Merge imports (merge_schedule_stream) match file items to rows by
+        # external_key and skip rows whose content_hash is unchanged since the
+        # last import. Rows created in the app have neither.
+        for table in ('phases', 'objectives', 'tasks'):
+            c.execute(f'ALTER TABLE {table} ADD COLUMN external_key TEXT')
+            c.execute(f'ALTER TABLE {table} ADD COLUMN content_hash TEXT')
+            c.execute(f'CREATE UNIQUE INDEX idx_{table}_external_key ON {table} (external_key)')
 
     # -----------------------------
     #         PHASES
@@ -116,23 +592,40 @@ class ArcanaeumDB:
            'phase_description': str
         }
         """
-        conn = sqlite3.connect(self.db_file)
+        conn = self.get_connection()
         c = conn.cursor()
-        c.execute('''INSERT INTO phases (phase_number, phase_title, phase_description)
-                     VALUES (?, ?, ?)''',
-                  (phase['phase_number'], phase['phase_title'], phase['phase_description']))
-        conn.commit()
-        conn.close()
-
-    def get_phases(self):
-        conn = sqlite3.connect(self.db_file)
+        c.execute(self._PHASE_INSERT_SQL, self._phase_params(phase))
+        self._commit(conn)
+
+    def add_phases_bulk(self, phases):
+        """
+        Inserts an iterable of phase dicts with a single executemany in one transaction.
+        """
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.executemany(self._PHASE_INSERT_SQL, (self._phase_params(p) for p in phases))
+        self._commit(conn)
+        return c.rowcount
+
+    _PHASE_INSERT_SQL = '''
+        INSERT INTO phases (phase_number, phase_title, phase_description)
+        VALUES (?, ?, ?)
+    '''
+
+    @staticmethod
+    def _phase_params(phase):
+        return (phase['phase_number'], phase['phase_title'], phase['phase_description'])
+
+    def get_phases(self, compact=False):
+        conn = self.get_connection()
         c = conn.cursor()
         c.execute('''
             SELECT id, phase_number, phase_title, phase_description
             FROM phases ORDER BY phase_number
         ''')
         rows = c.fetchall()
-        conn.close()
+        if compact:
+            return list(map(PhaseRow, rows))
         phases = []
         for r in rows:
             phases.append({
@@ -143,8 +636,28 @@ class ArcanaeumDB:
             })
         return phases
 
+    _PHASE_COLUMNS = 'id, phase_number, phase_title, phase_description'
+
+    def get_phases_page(self, after=None, limit=100, compact=False):
+        """
+        Keyset page of phases in get_phases() order; returns (phases, cursor).
+        """
+        rows, cursor = self._keyset_page(self._PHASE_COLUMNS, 'phases',
+                                         [('phase_number', False), ('id', False)],
+                                         '', (), after, limit)
+        if compact:
+            return list(map(PhaseRow, rows)), cursor
+        return [PhaseRow(r).to_dict() for r in rows], cursor
+
+    def get_phase_by_id(self, phase_id):
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute(f'SELECT {self._PHASE_COLUMNS} FROM phases WHERE id=?', (phase_id,))
+        r = c.fetchone()
+        return PhaseRow(r).to_dict() if r else None
+
     def update_phase(self, phase_id, phase):
-        conn = sqlite3.connect(self.db_file)
+        conn = self.get_connection()
         c = conn.cursor()
         c.execute('''
             UPDATE phases
@@ -152,15 +665,14 @@ class ArcanaeumDB:
             WHERE id=?
         ''',
                   (phase['phase_number'], phase['phase_title'], phase['phase_description'], phase_id))
-        conn.commit()
-        conn.close()
+        self._commit(conn)
 
     def delete_phase(self, phase_id):
         """
         Deleting a phase sets phase_id = NULL for tasks and objectives referencing it
         (or you could delete them, but let's keep them accessible).
         """
-        conn = sqlite3.connect(self.db_file)
+        conn = self.get_connection()
         c = conn.cursor()
         # Nullify tasks
         c.execute('UPDATE tasks SET phase_id=NULL, objective_id=NULL WHERE phase_id=?', (phase_id,))
@@ -168,8 +680,7 @@ class ArcanaeumDB:
         c.execute('UPDATE objectives SET phase_id=NULL WHERE phase_id=?', (phase_id,))
         # Delete the phase itself
         c.execute('DELETE FROM phases WHERE id=?', (phase_id,))
-        conn.commit()
-        conn.close()
+        self._commit(conn)
 
     # -----------------------------
     #         OBJECTIVES
@@ -183,25 +694,41 @@ class ArcanaeumDB:
           'completion_criteria': str
         }
         """
-        conn = sqlite3.connect(self.db_file)
+        conn = self.get_connection()
         c = conn.cursor()
-        c.execute('''
-            INSERT INTO objectives (phase_id, objective_name, objective_description, completion_criteria)
-            VALUES (?, ?, ?, ?)
-        ''', (objective['phase_id'], objective['objective_name'],
-              objective['objective_description'], objective.get('completion_criteria', '')))
-        conn.commit()
-        conn.close()
-
-    def get_objectives(self):
-        conn = sqlite3.connect(self.db_file)
+        c.execute(self._OBJECTIVE_INSERT_SQL, self._objective_params(objective))
+        self._commit(conn)
+
+    def add_objectives_bulk(self, objectives):
+        """
+        Inserts an iterable of objective dicts with a single executemany in one transaction.
+        """
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.executemany(self._OBJECTIVE_INSERT_SQL, (self._objective_params(o) for o in objectives))
+        self._commit(conn)
+        return c.rowcount
+
+    _OBJECTIVE_INSERT_SQL = '''
+        INSERT INTO objectives (phase_id, objective_name, objective_description, completion_criteria)
+        VALUES (?, ?, ?, ?)
+    '''
+
+    @staticmethod
+    def _objective_params(objective):
+        return (objective['phase_id'], objective['objective_name'],
+                objective['objective_description'], objective.get('completion_criteria', ''))
+
+    def get_objectives(self, compact=False):
+        conn = self.get_connection()
         c = conn.cursor()
         c.execute('''
             SELECT id, phase_id, objective_name, objective_description, completion_criteria
             FROM objectives
         ''')
         rows = c.fetchall()
-        conn.close()
+        if compact:
+            return list(map(ObjectiveRow, rows))
         objs = []
         for r in rows:
             objs.append({
@@ -213,201 +740,2335 @@ class ArcanaeumDB:
             })
         return objs
 
-    def update_objective(self, objective_id, objective):
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
-        c.execute('''
-            UPDATE objectives
-            SET phase_id=?, objective_name=?, objective_description=?, completion_criteria=?
-            WHERE id=?
-        ''',
-                  (objective['phase_id'], objective['objective_name'],
-                   objective['objective_description'], objective.get('completion_criteria', ''),
-                   objective_id))
-        conn.commit()
-        conn.close()
+    _OBJECTIVE_COLUMNS = 'id, phase_id, objective_name, objective_description, completion_criteria'
+
+    def get_objectives_page(self, after=None, limit=100, compact=False):
+        """
+        Keyset page of objectives by id; returns (objectives, cursor).
+        """
+        rows, cursor = self._keyset_page(self._OBJECTIVE_COLUMNS, 'objectives', [('id', False)],
+                                         '', (), after, limit)
+        if compact:
+            return list(map(ObjectiveRow, rows)), cursor
+        return [ObjectiveRow(r).to_dict() for r in rows], cursor
+
+    def get_objective_by_id(self, objective_id):
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute(f'SELECT {self._OBJECTIVE_COLUMNS} FROM objectives WHERE id=?', (objective_id,))
+        r = c.fetchone()
+        return ObjectiveRow(r).to_dict() if r else None
+
+    def update_objective(self, objective_id, objective):
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute('''
+            UPDATE objectives
+            SET phase_id=?, objective_name=?, objective_description=?, completion_criteria=?
+            WHERE id=?
+        ''',
+                  (objective['phase_id'], objective['objective_name'],
+                   objective['objective_description'], objective.get('completion_criteria', ''),
+                   objective_id))
+        self._commit(conn)
+
+    def delete_objective(self, objective_id):
+        """
+        Deleting an objective sets objective_id=NULL for tasks referencing it,
+        then removes the objective entry.
+        """
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute('UPDATE tasks SET objective_id=NULL WHERE objective_id=?', (objective_id,))
+        c.execute('DELETE FROM objectives WHERE id=?', (objective_id,))
+        self._commit(conn)
+
+    # -----------------------------
+    #         TASKS
+    # -----------------------------
+    def add_task(self, task):
+        """
+        task = {
+            'phase_id': ...,
+            'objective_id': ...,
+            'title': ...,
+            'description': ...,
+            'date': ...,
+            'status': ...,
+            'resources': [...],
+            'recurring': bool,
+            'priority': ...,
+            'category': ...,
+            'estimated_time': ...,
+            'completion_timestamp': ...
+        }
+        """
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute(self._TASK_INSERT_SQL, self._task_params(task))
+        task_id = c.lastrowid
+        self._set_task_resources(c, task_id, task.get('resources', []))
+        self._refresh_statuses(c, task_id=task_id)
+        self._commit(conn)
+        return task_id
+
+    def add_tasks_bulk(self, tasks):
+        """
+        Inserts an iterable of task dicts (same shape as add_task) with a single
+        executemany in one transaction. Returns the number of rows inserted.
+        """
+        resources = []
+
+        def params():
+            # Resources are collected on the way through so the iterable is only consumed once
+            for t in tasks:
+                resources.append(t.get('resources') or ())
+                yield self._task_params(t)
+
+        with self.transaction() as conn:
+            c = conn.cursor()
+            if self.has_fts:
+                # Indexing the whole batch with one INSERT ... SELECT is several
+                # times faster than letting the per-row trigger feed FTS5.
+                c.execute('INSERT INTO tasks_fts_paused (paused) VALUES (1)')
+            c.executemany(self._TASK_INSERT_SQL, params())
+            inserted = c.rowcount
+            if inserted > 0:
+                # Ids are consecutive: we are the only writer inside this transaction
+                first_id = c.execute('SELECT MAX(id) FROM tasks').fetchone()[0] - inserted + 1
+                c.executemany(
+                    'INSERT INTO task_resources (task_id, position, resource) VALUES (?, ?, ?)',
+                    ((first_id + i, pos, res)
+                     for i, task_resources in enumerate(resources)
+                     for pos, res in enumerate(task_resources))
+                )
+            if self.has_fts:
+                c.execute('DELETE FROM tasks_fts_paused')
+                if inserted > 0:
+                    c.execute('''
+                        INSERT INTO tasks_fts (rowid, title, description)
+                        SELECT id, title, description FROM tasks WHERE id >= ?
+                    ''', (first_id,))
+            if inserted > 0:
+                # Only the new rows can need their date-based status set
+                self._refresh_statuses(c, since_id=first_id)
+            return inserted
+
+    _TASK_INSERT_SQL = '''
+        INSERT INTO tasks (
+            phase_id, objective_id, title, description, date, status, recurring,
+            priority, category, estimated_time, completion_timestamp, estimated_minutes
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    @staticmethod
+    def _task_params(task):
+        return (task.get('phase_id', None),
+                task.get('objective_id', None),
+                task['title'],
+                task['description'],
+                task['date'],
+                task['status'],
+                1 if task.get('recurring', False) else 0,
+                task.get('priority', 'Medium'),
+                task.get('category', 'General'),
+                task.get('estimated_time', ''),
+                task.get('completion_timestamp', ''),
+                parse_duration(task.get('estimated_time', '')))
+
+    # Resources live in task_resources and are only loaded on request
+    _TASK_COLUMNS = '''
+        id, phase_id, objective_id, title, description, date, status,
+        recurring, priority, category, estimated_time, completion_timestamp
+    '''
+
+    @staticmethod
+    def _task_from_row(r):
+        return {
+            'id': r[0],
+            'phase_id': r[1],
+            'objective_id': r[2],
+            'title': r[3],
+            'description': r[4],
+            'date': r[5],
+            'status': r[6],
+            'recurring': bool(r[7]),
+            'priority': r[8],
+            'category': r[9],
+            'estimated_time': r[10],
+            'completion_timestamp': r[11]
+        }
+
+    def get_tasks(self, include_resources=False, compact=False):
+        """
+        Returns every task. Each task's 'resources' list is only filled in when
+        include_resources is true (it costs a second query). compact=True returns
+        read-only TaskRow records instead of dicts; those never carry resources.
+        """
+        if compact and include_resources:
+            raise ValueError("compact task rows cannot carry resources")
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute(f'SELECT {self._TASK_COLUMNS} FROM tasks')
+        if compact:
+            return list(map(TaskRow, c.fetchall()))
+        tasks = [self._task_from_row(r) for r in c.fetchall()]
+        if include_resources:
+            by_task = {}
+            c.execute('SELECT task_id, resource FROM task_resources ORDER BY task_id, position')
+            for task_id, res in c:
+                by_task.setdefault(task_id, []).append(res)
+            for t in tasks:
+                t['resources'] = by_task.get(t['id'], [])
+        return tasks
+
+    def get_task_resources(self, task_id):
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute('SELECT resource FROM task_resources WHERE task_id=? ORDER BY position', (task_id,))
+        return [r[0] for r in c.fetchall()]
+
+    @staticmethod
+    def _set_task_resources(c, task_id, resources):
+        c.execute('DELETE FROM task_resources WHERE task_id=?', (task_id,))
+        c.executemany(
+            'INSERT INTO task_resources (task_id, position, resource) VALUES (?, ?, ?)',
+            ((task_id, pos, res) for pos, res in enumerate(resources))
+        )
+
+    def query_tasks(self, filters=None, compact=False, order=None, limit=None, offset=0):
+        """
+        Returns only the tasks matching `filters`, evaluated in SQL. Recognised keys
+        (all optional; a missing key means "don't filter on it"):
+          'category', 'priority', 'status'  -> exact match on the stored value
+          'phase_id', 'objective_id'        -> exact id match; None selects tasks without one
+          'search'                          -> case-insensitive substring of title or description
+          'completed_since'                 -> completion_timestamp at or after this
+                                               'YYYY-MM-DD[ HH:MM:SS]' value
+        `order` is a list of (field, descending) pairs over TASK_SORT_FIELDS; rows
+        otherwise come back in insertion order, like get_tasks(). `limit`/`offset`
+        select one page. compact=True returns TaskRow records instead of dicts.
+        """
+        where, params = self._task_filter_clause(filters)
+        sql = f'SELECT {self._TASK_COLUMNS} FROM tasks {where} ORDER BY {self._task_order_clause(order)}'
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            params = params + [limit, offset]
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute(sql, params)
+        if compact:
+            return list(map(TaskRow, c.fetchall()))
+        return [self._task_from_row(r) for r in c.fetchall()]
+
+    def count_tasks(self, filters=None):
+        """
+        Number of tasks matching `filters` (same keys as query_tasks). Unfiltered
+        and status-only counts come straight from the status counters.
+        """
+        filters = filters or {}
+        if not filters:
+            return sum(self.get_status_counts().values())
+        if set(filters) == {'status'}:
+            return self.get_status_counts().get(filters['status'] or '', 0)
+        where, params = self._task_filter_clause(filters)
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute(f'SELECT COUNT(*) FROM tasks {where}', params)
+        return c.fetchone()[0]
+
+    # Sortable fields -> typed SQL sort key. Text columns compare case-blind,
+    # priority/status by their ordinal, the estimate by its parsed minutes and
+    # the phase by its phase number; a missing estimate/phase/objective sorts
+    # last (SORT_LAST). Arcanaeum._sort_key mirrors these keys in Python.
+    TASK_SORT_FIELDS = {
+        'title': "COALESCE(title, '') COLLATE NOCASE",
+        'date': 'date',     # bare, so idx_tasks_date serves it; NULL sorts first like ''
+        'status': "CASE status " + ' '.join(
+            f"WHEN '{k}' THEN {v}" for k, v in STATUS_ORDER.items()) + f" ELSE {len(STATUS_ORDER)} END",
+        'category': "COALESCE(category, '') COLLATE NOCASE",
+        'priority': "CASE priority " + ' '.join(
+            f"WHEN '{k}' THEN {v}" for k, v in PRIORITY_ORDER.items()) + f" ELSE {len(PRIORITY_ORDER)} END",
+        'estimated_time': f"COALESCE(estimated_minutes, {SORT_LAST})",
+        'phase_id': "COALESCE((SELECT phase_number FROM phases WHERE phases.id = tasks.phase_id), "
+                    f"{SORT_LAST})",
+        'objective_id': f"COALESCE(objective_id, {SORT_LAST})",
+        'completion_timestamp': 'completion_timestamp',
+    }
+
+    def _task_sort_keys(self, order):
+        keys = [(self.TASK_SORT_FIELDS[field], descending) for field, descending in order or ()]
+        # id last keeps the order total (stable between pages)
+        keys.append(('id', False))
+        return keys
+
+    def _task_order_clause(self, order):
+        return self._order_clause(self._task_sort_keys(order))
+
+    @staticmethod
+    def _order_clause(keys):
+        return ', '.join(f"{expr} {'DESC' if descending else 'ASC'}" for expr, descending in keys)
+
+    @staticmethod
+    def _never_null(expr):
+        # The primary key and the COALESCE/CASE sort keys can't be NULL
+        return expr == 'id' or expr.startswith(('COALESCE(', 'CASE '))
+
+    @classmethod
+    def _keyset_clause(cls, keys, after):
+        """
+        WHERE condition selecting the rows that come after the cursor `after`
+        (one value per sort key) in the order given by `keys`, a list of
+        (sql expression, descending) pairs ending in a unique key. Expands to
+            k1 >= v1 AND (k1 > v1 OR (k1 IS v1 AND k2 > v2) OR ...)
+        with '>' meaning "later in that key's direction". The leading range on
+        k1 lets SQLite seek an index on it instead of scanning from the start.
+        SQLite sorts NULL first ascending and last descending; the comparisons
+        follow suit.
+        """
+        terms = []
+        params = []
+        prefix = []
+        prefix_params = []
+        for (expr, descending), value in zip(keys, after):
+            nullable = not cls._never_null(expr)
+            op = '<' if descending else '>'
+            if value is None:
+                later = '0' if descending else f'{expr} IS NOT NULL'
+                later_params = []
+            elif descending and nullable:
+                later = f'({expr} < ? OR {expr} IS NULL)'
+                later_params = [value]
+            else:
+                later = f'{expr} {op} ?'
+                later_params = [value]
+            terms.append(' AND '.join(prefix + [later]))
+            params += prefix_params + later_params
+            prefix.append(f'{expr} IS ?')
+            prefix_params.append(value)
+        clause = '(' + ' OR '.join(f'({t})' for t in terms) + ')'
+
+        (expr, descending), value = keys[0], after[0]
+        if value is not None and not (descending and not cls._never_null(expr)):
+            clause = f"{expr} {'<=' if descending else '>='} ? AND {clause}"
+            params.insert(0, value)
+        return clause, params
+
+    def _keyset_page(self, columns, table, keys, where, params, after, limit, offset=0):
+        """
+        One page of `table` in `keys` order (`where`: '' or a 'WHERE ...'
+        clause with its `params`): the rows after cursor `after`
+        (None = from the start), skipping `offset` more. Returns (rows, cursor)
+        where cursor holds the last row's sort-key values (None for an empty
+        page); pass it back as `after` for the next page. A page shorter than
+        `limit` is the last one.
+        """
+        params = list(params)
+        if after is not None:
+            clause, keyset_params = self._keyset_clause(keys, after)
+            where = f'{where} AND {clause}' if where else f'WHERE {clause}'
+            params += keyset_params
+        sql = (f'SELECT {columns}, {", ".join(expr for expr, _ in keys)} FROM {table} {where} '
+               f'ORDER BY {self._order_clause(keys)} LIMIT ? OFFSET ?')
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute(sql, params + [limit, offset])
+        rows = c.fetchall()
+        n = len(keys)
+        cursor = tuple(rows[-1][-n:]) if rows else None
+        return [r[:-n] for r in rows], cursor
+
+    def get_tasks_page(self, after=None, limit=100, filters=None, order=None, compact=False, offset=0):
+        """
+        Keyset-paged query_tasks(): returns (tasks, cursor) for the `limit` tasks
+        matching `filters` that follow `after` in `order`. The cursor is the last
+        task's (sort key values..., id); the cost of a page does not grow with
+        how deep into the list it is, unlike query_tasks(offset=...).
+        """
+        where, params = self._task_filter_clause(filters)
+        rows, cursor = self._keyset_page(self._TASK_COLUMNS, 'tasks', self._task_sort_keys(order),
+                                         where, params, after, limit, offset)
+        if compact:
+            return list(map(TaskRow, rows)), cursor
+        return [self._task_from_row(r) for r in rows], cursor
+
+    def _task_filter_clause(self, filters):
+        clauses = []
+        params = []
+        filters = filters or {}
+        for column in ('category', 'priority', 'status'):
+            if column in filters:
+                clauses.append(f'{column} = ?')
+                params.append(filters[column])
+        for column in ('phase_id', 'objective_id'):
+            if column in filters:
+                if filters[column] is None:
+                    clauses.append(f'{column} IS NULL')
+                else:
+                    clauses.append(f'{column} = ?')
+                    params.append(filters[column])
+        query = filters.get('search')
+        if query and self._use_fts(query):
+            clauses.append('id IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)')
+            params.append(self._fts_phrase(query))
+        elif query:
+            pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            clauses.append("(title LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')")
+            params.extend([pattern, pattern])
+        if filters.get('completed_since'):
+            clauses.append('completion_timestamp >= ?')
+            params.append(filters['completed_since'])
+        if not clauses:
+            return '', []
+        return 'WHERE ' + ' AND '.join(clauses), params
+
+    # Trigrams need at least three characters; shorter queries use LIKE.
+    FTS_MIN_QUERY = 3
+
+    def _use_fts(self, query):
+        return self.has_fts and len(query) >= self.FTS_MIN_QUERY
+
+    @staticmethod
+    def _fts_phrase(query):
+        # Quote as one FTS5 string so operators/punctuation are matched literally.
+        return '"' + query.replace('"', '""') + '"'
+
+    def search_tasks(self, query, limit=50, mark=('[', ']')):
+        """
+        Full-text search over task titles and descriptions.
+        Returns up to `limit` dicts, best match first:
+          {'id': int, 'rank': float, 'title': str, 'snippet': str}
+        where matches in 'title' and the description 'snippet' are wrapped in `mark`.
+        """
+        if not query:
+            return []
+        conn = self.get_connection()
+        c = conn.cursor()
+        if self._use_fts(query):
+            c.execute('''
+                SELECT rowid, rank,
+                       highlight(tasks_fts, 0, ?, ?),
+                       snippet(tasks_fts, 1, ?, ?, '...', 12)
+                FROM tasks_fts
+                WHERE tasks_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            ''', (mark[0], mark[1], mark[0], mark[1], self._fts_phrase(query), limit))
+            return [{'id': r[0], 'rank': r[1], 'title': r[2], 'snippet': r[3]}
+                    for r in c.fetchall()]
+
+        # Fallback: unranked substring scan, no highlighting
+        where, params = self._task_filter_clause({'search': query})
+        c.execute(f'SELECT id, title, description FROM tasks {where} ORDER BY id LIMIT ?',
+                  params + [limit])
+        return [{'id': r[0], 'rank': 0.0, 'title': r[1], 'snippet': (r[2] or '')[:80]}
+                for r in c.fetchall()]
+
+    def get_tasks_by_day(self, start, end):
+        """
+        Tasks dated from `start` to `end` inclusive ('YYYY-MM-DD' strings or
+        dates), bucketed by day: {'YYYY-MM-DD': [TaskRow, ...]}. One range scan
+        of idx_tasks_date; days without tasks are absent.
+        """
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute(f'SELECT {self._TASK_COLUMNS} FROM tasks WHERE date BETWEEN ? AND ? ORDER BY date, id',
+                  (str(start), str(end)))
+        by_day = {}
+        for r in c.fetchall():
+            row = TaskRow(r)
+            by_day.setdefault(row.date, []).append(row)
+        return by_day
+
+    def get_task_by_id(self, task_id, include_resources=True):
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute(f'SELECT {self._TASK_COLUMNS} FROM tasks WHERE id=?', (task_id,))
+        r = c.fetchone()
+        if r:
+            task = self._task_from_row(r)
+            if include_resources:
+                task['resources'] = self.get_task_resources(task_id)
+            return task
+        return None
+
+    def update_task(self, task_id, task):
+        """
+        Overwrites the task's fields. Its resources are only replaced when
+        `task` carries a 'resources' key.
+        """
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute('''
+            UPDATE tasks
+            SET phase_id=?, objective_id=?, title=?, description=?, date=?, status=?,
+                recurring=?, priority=?, category=?, estimated_time=?, completion_timestamp=?,
+                estimated_minutes=?
+            WHERE id=?
+        ''', self._task_params(task) + (task_id,))
+        if 'resources' in task:
+            self._set_task_resources(c, task_id, task['resources'])
+        self._refresh_statuses(c, task_id=task_id)
+        self._commit(conn)
+
+    def refresh_statuses(self, today=None):
+        """
+        Re-derives the date-based status of open tasks with a single UPDATE:
+        Pending/Ahead tasks dated before `today` become Behind, after it Ahead,
+        and on it Pending. Only rows whose status actually changes are written.
+        Returns the number of tasks changed.
+        """
+        conn = self.get_connection()
+        c = conn.cursor()
+        changed = self._refresh_statuses(c, today)
+        self._commit(conn)
+        return changed
+
+    def _refresh_statuses(self, c, today=None, task_id=None, since_id=None):
+        today = (today or datetime.date.today()).strftime('%Y-%m-%d')
+        new_status = '''
+            CASE WHEN date < :today THEN 'Behind'
+                 WHEN date > :today THEN 'Ahead'
+                 ELSE 'Pending' END
+        '''
+        sql = f'''
+            UPDATE tasks SET status = {new_status}
+            WHERE status IN ('Pending', 'Ahead')
+              AND date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+              AND status <> {new_status}
+        '''
+        params = {'today': today}
+        if task_id is not None:
+            sql += ' AND id = :task_id'
+            params['task_id'] = task_id
+        if since_id is not None:
+            sql += ' AND id >= :since_id'
+            params['since_id'] = since_id
+        c.execute(sql, params)
+        return c.rowcount
+
+    def get_status_counts(self):
+        """
+        Returns {status: number_of_tasks} from the trigger-maintained counters
+        (tasks without a status are counted under '').
+        """
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute('SELECT status, n FROM task_status_counts WHERE n > 0')
+        return dict(c.fetchall())
+
+    def get_progress(self):
+        """
+        Returns (completed, total) task counts.
+        """
+        counts = self.get_status_counts()
+        return counts.get('Completed', 0), sum(counts.values())
+
+    # -----------------------------
+    #         STARTUP SNAPSHOT
+    # -----------------------------
+    def get_startup_snapshot(self, page_size, today=None):
+        """
+        Everything the main window shows on start-up, read in one transaction so
+        the parts agree with each other:
+          'phases', 'objectives'  compact rows for the filter choices and labels
+          'status_counts'         progress bar and the unfiltered list total
+          'first_page'            get_tasks_page(limit=page_size) in default order
+          'due_today'             open tasks dated today, for notifications
+        """
+        today = today or datetime.date.today()
+        with self.read_transaction():
+            due = self.get_tasks_by_day(today, today).get(today.isoformat(), [])
+            return {
+                'phases': self.get_phases(compact=True),
+                'objectives': self.get_objectives(compact=True),
+                'status_counts': self.get_status_counts(),
+                'first_page': self.get_tasks_page(limit=page_size, compact=True),
+                'due_today': [t for t in due if t.status in ('Pending', 'Behind', 'Ahead')],
+            }
+
+    # -----------------------------
+    #         STATISTICS
+    # -----------------------------
+    # Overdue ageing buckets: (label, lower bound in days overdue)
+    OVERDUE_BUCKETS = (('1-7 days', 1), ('8-30 days', 8), ('31-90 days', 31), ('90+ days', 91))
+    COMPLETION_DAYS = 30
+    COMPLETION_WEEKS = 26
+
+    def get_statistics(self, today=None):
+        """
+        Aggregates for StatsView, each computed by a GROUP BY in SQL:
+          'by_status'      {status: count}
+          'by_category'    [(category, total, completed), ...]  largest first
+          'by_phase'       [(label, total, completed), ...]     by phase number
+          'by_objective'   [(label, total, completed), ...]     largest first
+          'per_day'        [('YYYY-MM-DD', completions), ...]   last COMPLETION_DAYS days
+          'per_week'       [('YYYY-Www', completions), ...]     last COMPLETION_WEEKS weeks
+          'overdue'        [(bucket label, count), ...]         open tasks past their date
+        The result is cached until the next write (see write_version) or the
+        date changes, so reopening the statistics costs nothing.
+        """
+        today = today or datetime.date.today()
+        cached = self._stats_cache
+        if cached is not None and cached[0] == self.write_version and cached[1] == today:
+            return cached[2]
+        version = self.write_version
+
+        conn = self.get_connection()
+        c = conn.cursor()
+        stats = {'by_status': self.get_status_counts()}
+
+        c.execute('''
+            SELECT COALESCE(category, ''), COUNT(*), SUM(status = 'Completed')
+            FROM tasks GROUP BY 1 ORDER BY 2 DESC
+        ''')
+        stats['by_category'] = c.fetchall()
+
+        c.execute('''
+            SELECT t.phase_id, p.phase_number, p.phase_title, COUNT(*), SUM(t.status = 'Completed')
+            FROM tasks t LEFT JOIN phases p ON p.id = t.phase_id
+            GROUP BY t.phase_id ORDER BY p.phase_number IS NULL, p.phase_number
+        ''')
+        stats['by_phase'] = [
+            (self._group_label(pid, title, f"{number}: {title}", "No Phase"), total, completed)
+            for pid, number, title, total, completed in c.fetchall()
+        ]
+
+        c.execute('''
+            SELECT t.objective_id, o.objective_name, COUNT(*), SUM(t.status = 'Completed')
+            FROM tasks t LEFT JOIN objectives o ON o.id = t.objective_id
+            GROUP BY t.objective_id ORDER BY 3 DESC
+        ''')
+        stats['by_objective'] = [
+            (self._group_label(oid, name, f"{oid} - {name}", "No Objective"), total, completed)
+            for oid, name, total, completed in c.fetchall()
+        ]
+
+        since = today - datetime.timedelta(days=self.COMPLETION_DAYS - 1)
+        c.execute('''
+            SELECT substr(completion_timestamp, 1, 10), COUNT(*)
+            FROM tasks WHERE status = 'Completed' AND completion_timestamp >= ?
+            GROUP BY 1 ORDER BY 1
+        ''', (since.isoformat(),))
+        stats['per_day'] = c.fetchall()
+
+        since = today - datetime.timedelta(weeks=self.COMPLETION_WEEKS - 1, days=today.weekday())
+        c.execute('''
+            SELECT strftime('%Y-W%W', completion_timestamp), COUNT(*)
+            FROM tasks WHERE status = 'Completed' AND completion_timestamp >= ?
+            GROUP BY 1 ORDER BY 1
+        ''', (since.isoformat(),))
+        stats['per_week'] = [(week, n) for week, n in c.fetchall() if week is not None]
+
+        bucket_sql = ' '.join(
+            f"WHEN julianday(?) - julianday(date) >= {low} THEN {i}"
+            for i, (_, low) in reversed(list(enumerate(self.OVERDUE_BUCKETS)))
+        )
+        c.execute(f'''
+            SELECT CASE {bucket_sql} END AS bucket, COUNT(*)
+            FROM tasks WHERE status <> 'Completed' AND date < ? AND julianday(date) IS NOT NULL
+            GROUP BY bucket
+        ''', [today.isoformat()] * len(self.OVERDUE_BUCKETS) + [today.isoformat()])
+        counts = dict(c.fetchall())
+        stats['overdue'] = [(label, counts.get(i, 0)) for i, (label, _) in enumerate(self.OVERDUE_BUCKETS)]
+
+        self._stats_cache = (version, today, stats)
+        return stats
+
+    @staticmethod
+    def _group_label(ref_id, name, label, none_label):
+        if ref_id is None:
+            return none_label
+        # Tasks can still point at a phase/objective that no longer exists
+        return label if name is not None else f"#{ref_id} (missing)"
+
+    def delete_task(self, task_id):
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute('DELETE FROM tasks WHERE id=?', (task_id,))
+        self._commit(conn)
+
+    # -----------------------------
+    #       REFLECTIONS
+    # -----------------------------
+    def add_reflection(self, content):
+        conn = self.get_connection()
+        c = conn.cursor()
+        timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        c.execute('INSERT INTO reflections (timestamp, content) VALUES (?, ?)', (timestamp, content))
+        self._commit(conn)
+
+    def get_reflections(self, compact=False):
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute('SELECT id, timestamp, content FROM reflections ORDER BY id DESC')
+        rows = c.fetchall()
+        if compact:
+            return list(map(ReflectionRow, rows))
+        result = []
+        for r in rows:
+            result.append({
+                'id': r[0],
+                'timestamp': r[1],
+                'content': r[2]
+            })
+        return result
+
+    def get_reflections_page(self, after=None, limit=100, compact=False):
+        """
+        Keyset page of reflections, newest first; returns (reflections, cursor).
+        """
+        rows, cursor = self._keyset_page('id, timestamp, content', 'reflections', [('id', True)],
+                                         '', (), after, limit)
+        if compact:
+            return list(map(ReflectionRow, rows)), cursor
+        return [ReflectionRow(r).to_dict() for r in rows], cursor
+
+    def delete_reflection(self, reflection_id):
+        conn = self.get_connection()
+        c = conn.cursor()
+        c.execute('DELETE FROM reflections WHERE id=?', (reflection_id,))
+        self._commit(conn)
+
+    # -----------------------------
+    #         BULK REPLACE
+    # -----------------------------
+    PROGRESS_EVERY = 500
+
+    IMPORT_BATCH = 1000
+
+    def replace_schedule_stream(self, records, cancel=None, batch_size=IMPORT_BATCH):
+        """
+        Replaces every task, phase and objective in a single transaction.
+        `records` yields (section, item) pairs, section being 'phases', 'objectives' or 'tasks' (anything else is
+        ignored), in any order. Items are inserted in batches of `batch_size`
+        inside one transaction, so only a batch per section is held in memory.
+        `cancel` is checked between batches; cancelling rolls everything back.
+
+        phase_id/objective_id in the items refer to ids in the file: an item's
+        'id', or its 1-based position in its section when it has none. They
+        are rewritten to the new rows' ids once everything is in (see
+        _remap_references); references to ids the file does not contain are
+        cleared. Returns {section: {'inserted': rows,
+        'unresolved': references cleared}}.
+        """
+        with self.transaction() as conn:
+            c = conn.cursor()
+            c.execute('DELETE FROM tasks')
+            c.execute('DELETE FROM phases')
+            c.execute('DELETE FROM objectives')
+            self._create_id_maps(c)
+            positions = collections.Counter()
+
+            def mapped(section, insert):
+                def handler(items):
+                    insert(items)
+                    # Ids are consecutive: we are the only writer inside this transaction
+                    first_id = c.execute(f'SELECT MAX(id) FROM {section}').fetchone()[0] - len(items) + 1
+                    c.executemany(
+                        f'INSERT OR REPLACE INTO temp.import_ids_{section} (old_id, new_id) VALUES (?, ?)',
+                        ((self._source_id(section, item, positions), first_id + i)
+                         for i, item in enumerate(items)))
+                return handler
+
+            counts = self._in_batches(records, {
+                'phases': mapped('phases', self.add_phases_bulk),
+                'objectives': mapped('objectives', self.add_objectives_bulk),
+                'tasks': self.add_tasks_bulk,
+            }, cancel, batch_size)
+            result = {section: {'inserted': n, 'unresolved': self._remap_references(c, section, section)}
+                      for section, n in counts.items()}
+            self._drop_temp_tables(c, self._ID_MAPS)
+            return result
+
+    @staticmethod
+    def _in_batches(records, handlers, cancel, batch_size):
+        # Routes (section, item) records to handlers[section](list_of_items) in
+        # batches of batch_size; other sections are skipped. Returns {section: items}.
+        batches = {section: [] for section in handlers}
+        counts = dict.fromkeys(handlers, 0)
+
+        def flush(section):
+            if cancel is not None:
+                cancel.check()
+            handlers[section](batches[section])
+            counts[section] += len(batches[section])
+            batches[section] = []
+
+        for section, item in records:
+            batch = batches.get(section)
+            if batch is None:
+                continue
+            batch.append(item)
+            if len(batch) >= batch_size:
+                flush(section)
+        for section, batch in batches.items():
+            if batch:
+                flush(section)
+        return counts
+
+    # -----------------------------
+    #         IMPORTED REFERENCES
+    # -----------------------------
+    # (section, column, section it references). In an import file these hold
+    # file ids; temp.import_ids_<section> maps them (old_id) to row ids (new_id).
+    _REFERENCES = (
+        ('objectives', 'phase_id', 'phases'),
+        ('tasks', 'phase_id', 'phases'),
+        ('tasks', 'objective_id', 'objectives'),
+    )
+    _ID_MAPS = ('temp.import_ids_phases', 'temp.import_ids_objectives')
+
+    def _create_id_maps(self, c):
+        self._drop_temp_tables(c, self._ID_MAPS)
+        for id_map in self._ID_MAPS:
+            # old_id is untyped: a file may use any JSON scalar as an id
+            c.execute(f'CREATE TABLE {id_map} (old_id PRIMARY KEY, new_id INTEGER NOT NULL)')
+
+    @staticmethod
+    def _drop_temp_tables(c, tables):
+        for table in tables:
+            c.execute(f'DROP TABLE IF EXISTS {table}')
+
+    @staticmethod
+    def _source_id(section, item, positions):
+        # An item's id in its file: its own 'id', else its 1-based position in the section
+        positions[section] += 1
+        source_id = item.get('id')
+        return positions[section] if source_id is None else source_id
+
+    def _remap_references(self, c, section, table):
+        """
+        Rewrites the reference columns of `section`'s rows in `table` from file
+        ids to row ids through the import_ids maps. References with no entry in
+        the map are found with one anti-join per column and set to NULL first;
+        their number is returned. Rows whose id did not change are not written.
+        """
+        unresolved = 0
+        for referrer, column, target in self._REFERENCES:
+            if referrer != section:
+                continue
+            id_map = f'temp.import_ids_{target}'
+            unresolved += c.execute(f'''
+                UPDATE {table} SET {column} = NULL
+                WHERE {column} IS NOT NULL
+                  AND NOT EXISTS (SELECT 1 FROM {id_map} m WHERE m.old_id = {table}.{column})
+            ''').rowcount
+            c.execute(f'''
+                UPDATE {table} SET {column} = m.new_id
+                FROM {id_map} m
+                WHERE {table}.{column} = m.old_id AND m.new_id IS NOT m.old_id
+            ''')
+        return unresolved
+
+    # -----------------------------
+    #         MERGE IMPORT
+    # -----------------------------
+    # section (= table): (columns an import writes, in _*_params() order,
+    #                     natural key of items without an 'external_key',
+    #                     column naming a row in merge summaries)
+    _MERGE_SECTIONS = {
+        'phases': (('phase_number', 'phase_title', 'phase_description'),
+                   ('phase_number',), 'phase_title'),
+        'objectives': (('phase_id', 'objective_name', 'objective_description', 'completion_criteria'),
+                       ('objective_name',), 'objective_name'),
+        'tasks': (('phase_id', 'objective_id', 'title', 'description', 'date', 'status', 'recurring',
+                   'priority', 'category', 'estimated_time', 'completion_timestamp', 'estimated_minutes'),
+                  ('title',), 'title'),
+    }
+    MERGE_EXAMPLES = 10
+    ICS_KEY_PREFIX = 'ics:'
+    # Imports whose keys carry one of these prefixes are merged on their own
+    # (key_prefix); merges of anything else leave their rows alone.
+    _SCOPED_KEY_PREFIXES = (ICS_KEY_PREFIX,)
+
+    def merge_schedule_stream(self, records, dry_run=False, cancel=None, batch_size=IMPORT_BATCH,
+                              key_prefix=''):
+        """
+        Merges (section, item) records, as taken by replace_schedule_stream(),
+        into the DB instead of replacing it. Items are matched to rows by
+        external_key: the item's 'external_key' if it has one, else one derived
+        from its natural key (phase_number, objective_name or task title) and
+        its occurrence number among items sharing it. For each section present
+        in `records`, in one transaction:
+          - unmatched items are inserted;
+          - matched rows are rewritten only when the item differs from the one
+            last imported into them (content_hash), so local edits to rows the
+            file did not change survive; a task completed locally keeps its
+            status and completion_timestamp. The hash covers the item's own
+            fields plus the rows its links resolve to, not its file ids, so
+            renumbering the file changes nothing and an item that only moved
+            to another parent is just relinked;
+          - imported rows missing from the file are deleted, clearing references
+            to them as delete_phase()/delete_objective() do.
+        Rows created in the app carry no key and are never deleted; one whose
+        derived key matches an item nothing else claims is adopted by it.
+        phase_id/objective_id are file ids as in replace_schedule_stream(),
+        mapped to the rows the referenced items were merged into; when the
+        file has no phases (objectives) they are taken as existing row ids.
+        key_prefix (one of _SCOPED_KEY_PREFIXES) is put in front of every key,
+        and only rows whose key has it are candidates for deletion.
+        dry_run=True works the changes out and rolls them back. Returns
+        {section: {'inserted', 'updated', 'deleted', 'unchanged', 'unresolved':
+        count, 'examples': [(op, label), ...]}}, op being '+', '~' or '-', with
+        up to MERGE_EXAMPLES examples per op.
+        """
+        params = {
+            'phases': self._phase_params,
+            'objectives': self._objective_params,
+            'tasks': self._task_params,
+        }
+        occurrences = collections.Counter()
+        positions = collections.Counter()
+
+        def staged_rows(section, items):
+            columns, natural, _label = self._MERGE_SECTIONS[section]
+            natural_at = [columns.index(col) for col in natural]
+            # The hash covers the item's own content; file ids depend on where
+            # items sit in the file, parent links are added once remapped
+            links = self._link_columns(section)
+            hashed_at = [i for i, col in enumerate(columns + self._merge_extra_columns(section))
+                         if col not in links and col != 'source_id']
+            for item in items:
+                values = params[section](item)
+                if section == 'tasks':
+                    values += (json.dumps(list(item.get('resources') or ())),)
+                else:
+                    values += (self._source_id(section, item, positions),)
+                key = item.get('external_key')
+                if key is None:
+                    natural_key = tuple(values[i] for i in natural_at)
+                    occurrences[section, natural_key] += 1
+                    key = self._derived_key(natural_key, occurrences[section, natural_key])
+                key = key_prefix + str(key)
+                content = json.dumps([values[i] for i in hashed_at])
+                content_hash = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+                yield (key, content_hash) + values
+
+        # A dry run ends in a rollback, so it does not count as a write
+        # (write_version stays put and query caches stay valid)
+        with (self.read_transaction() if dry_run else self.transaction()) as conn:
+            c = conn.cursor()
+            c.execute('SAVEPOINT merge_import')
+            self._create_merge_tables(c)
+
+            def stager(section):
+                columns = self._MERGE_SECTIONS[section][0] + self._merge_extra_columns(section)
+                sql = (f'INSERT OR REPLACE INTO temp.merge_{section} '
+                       f'(external_key, content_hash, {", ".join(columns)}) '
+                       f'VALUES ({", ".join("?" * (len(columns) + 2))})')
+                return lambda items: c.executemany(sql, staged_rows(section, items))
+
+            counts = self._in_batches(records, {section: stager(section) for section in self._MERGE_SECTIONS},
+                                      cancel, batch_size)
+            # Parents first, so their id maps are complete before children are merged
+            summary = {}
+            for section in self._MERGE_SECTIONS:
+                if counts[section]:
+                    unresolved = self._remap_references(c, section, f'temp.merge_{section}')
+                    self._hash_links(c, section)
+                    summary[section] = self._merge_section(c, section, key_prefix)
+                    summary[section]['unresolved'] = unresolved
+                if section != 'tasks':
+                    self._map_merged_ids(c, section, staged=counts[section] > 0)
+            if dry_run:
+                c.execute('ROLLBACK TO merge_import')
+            else:
+                self._drop_temp_tables(c, [f'temp.merge_{section}' for section in self._MERGE_SECTIONS]
+                                       + ['temp.merge_plan', 'temp.merge_unlinked', *self._ID_MAPS])
+            c.execute('RELEASE merge_import')
+        return summary
+
+    def _link_columns(self, section):
+        return [column for referrer, column, _target in self._REFERENCES if referrer == section]
+
+    @staticmethod
+    def _hashed_content(expr):
+        # SQL for the part of a content_hash before the parent links
+        return f"substr({expr}, 1, instr({expr} || '/', '/') - 1)"
+
+    def _hash_links(self, c, section):
+        # Parent links join the hash as the row ids they were remapped to, so
+        # renumbering the file leaves it alone while moving an item changes it
+        links = self._link_columns(section)
+        if links:
+            c.execute(f'''
+                UPDATE temp.merge_{section}
+                SET content_hash = content_hash || {" || ".join(f"'/' || COALESCE({col}, '')" for col in links)}
+            ''')
+
+    @staticmethod
+    def _merge_extra_columns(section):
+        # Staged alongside an item's values: a task's resources (JSON array),
+        # a phase's or objective's id in the file
+        return ('resources',) if section == 'tasks' else ('source_id',)
+
+    def _map_merged_ids(self, c, section, staged):
+        id_map = f'temp.import_ids_{section}'
+        if staged:
+            c.execute(f'''
+                INSERT OR REPLACE INTO {id_map} (old_id, new_id)
+                SELECT s.source_id, t.id FROM temp.merge_{section} s
+                JOIN {section} t ON t.external_key = s.external_key
+                ORDER BY s.seq
+            ''')
+        else:
+            # Not in the file: references are to the rows already in the DB
+            c.execute(f'INSERT INTO {id_map} (old_id, new_id) SELECT id, id FROM {section}')
+
+    @staticmethod
+    def _derived_key(natural_key, occurrence):
+        digest = hashlib.blake2b(json.dumps([natural_key, occurrence]).encode(), digest_size=12)
+        return 'auto:' + digest.hexdigest()
+
+    def _create_merge_tables(self, c):
+        for section, (columns, _natural, _label) in self._MERGE_SECTIONS.items():
+            c.execute(f'DROP TABLE IF EXISTS temp.merge_{section}')
+            c.execute(f'''
+                CREATE TEMP TABLE merge_{section} (
+                    seq INTEGER PRIMARY KEY,
+                    external_key TEXT NOT NULL UNIQUE,
+                    content_hash TEXT NOT NULL,
+                    {", ".join(columns + self._merge_extra_columns(section))}
+                )
+            ''')
+        # What merging a section will do: '+' insert staged row seq, '~' rewrite
+        # row id from staged row seq, '-' delete row id, '>' relink reference
+        # column ref (every link when NULL) of unchanged row id to staged row seq
+        c.execute('DROP TABLE IF EXISTS temp.merge_plan')
+        c.execute('CREATE TEMP TABLE merge_plan (op TEXT NOT NULL, id INTEGER, seq INTEGER, ref TEXT)')
+        # References the merge itself cleared when their target was removed
+        c.execute('DROP TABLE IF EXISTS temp.merge_unlinked')
+        c.execute('CREATE TEMP TABLE merge_unlinked (tbl TEXT NOT NULL, col TEXT NOT NULL, id INTEGER NOT NULL)')
+        self._create_id_maps(c)
+
+    def _merge_section(self, c, section, key_prefix):
+        columns, _natural, label = self._MERGE_SECTIONS[section]
+        staged = f'temp.merge_{section}'
+        self._adopt_local_rows(c, section, key_prefix)
+        if key_prefix:
+            in_scope, scope_params = 't.external_key GLOB ?', (key_prefix + '*',)
+        else:
+            scope_params = tuple(prefix + '*' for prefix in self._SCOPED_KEY_PREFIXES)
+            in_scope = ' AND '.join(['t.external_key NOT GLOB ?'] * len(scope_params)) or '1'
+
+        c.execute('DELETE FROM temp.merge_plan')
+        c.execute(f'''
+            INSERT INTO temp.merge_plan (op, id, seq)
+            SELECT '~', t.id, s.seq FROM {section} t JOIN {staged} s ON s.external_key = t.external_key
+            WHERE {self._hashed_content('t.content_hash')} IS NOT {self._hashed_content('s.content_hash')}
+        ''')
+        c.execute(f'''
+            INSERT INTO temp.merge_plan (op, id, seq)
+            SELECT '+', NULL, s.seq FROM {staged} s
+            WHERE NOT EXISTS (SELECT 1 FROM {section} t WHERE t.external_key = s.external_key)
+        ''')
+        c.execute(f'''
+            INSERT INTO temp.merge_plan (op, id, seq)
+            SELECT '-', t.id, NULL FROM {section} t
+            WHERE t.external_key IS NOT NULL AND {in_scope}
+              AND NOT EXISTS (SELECT 1 FROM {staged} s WHERE s.external_key = t.external_key)
+        ''', scope_params)
+        # Same content, but the file moved the item to another parent: only its
+        # links follow the file
+        c.execute(f'''
+            INSERT INTO temp.merge_plan (op, id, seq)
+            SELECT '>', t.id, s.seq FROM {section} t JOIN {staged} s ON s.external_key = t.external_key
+            WHERE t.content_hash IS NOT s.content_hash
+              AND {self._hashed_content('t.content_hash')} IS {self._hashed_content('s.content_hash')}
+        ''')
+        for referrer, column, target in self._REFERENCES:
+            if referrer == section:
+                # An unchanged row whose reference was left dangling (its target
+                # was deleted, e.g. renumbered out of the file) or was cleared by
+                # this merge follows the file again; one the user cleared stays
+                c.execute(f'''
+                    INSERT INTO temp.merge_plan (op, id, seq, ref)
+                    SELECT '>', t.id, s.seq, ? FROM {section} t JOIN {staged} s ON s.external_key = t.external_key
+                    WHERE t.content_hash IS s.content_hash
+                      AND s.{column} IS NOT NULL AND t.{column} IS NOT s.{column}
+                      AND (t.{column} IS NOT NULL
+                               AND NOT EXISTS (SELECT 1 FROM {target} r WHERE r.id = t.{column})
+                           OR t.id IN (SELECT id FROM temp.merge_unlinked WHERE tbl = ? AND col = ?))
+                ''', (column, section, column))
+        planned = dict(c.execute(
+            'SELECT op, COUNT(DISTINCT COALESCE(seq, id)) FROM temp.merge_plan GROUP BY op').fetchall())
+        staged_count = c.execute(f'SELECT COUNT(*) FROM {staged}').fetchone()[0]
+        examples = []
+        for op, ops in (('+', ('+',)), ('~', ('~', '>')), ('-', ('-',))):
+            examples += c.execute(f'''
+                SELECT ?, COALESCE(s.{label}, t.{label}) FROM temp.merge_plan p
+                LEFT JOIN {staged} s ON s.seq = p.seq
+                LEFT JOIN {section} t ON t.id = p.id
+                WHERE p.op IN ({", ".join("?" * len(ops))})
+                GROUP BY COALESCE(p.seq, p.id) ORDER BY COALESCE(p.seq, p.id) LIMIT ?
+            ''', (op, *ops, self.MERGE_EXAMPLES)).fetchall()
+
+        if section == 'phases':
+            self._unlink_removed(c, 'tasks', 'phase_id', ('phase_id', 'objective_id'))
+            self._unlink_removed(c, 'objectives', 'phase_id', ('phase_id',))
+        elif section == 'objectives':
+            self._unlink_removed(c, 'tasks', 'objective_id', ('objective_id',))
+        c.execute(f"DELETE FROM {section} WHERE id IN (SELECT id FROM temp.merge_plan WHERE op = '-')")
+
+        assignments = {col: f's.{col}' for col in columns}
+        if section == 'tasks':
+            # A local completion outlives a re-import that still has the task open
+            kept = "tasks.status = 'Completed' AND s.status IS NOT 'Completed'"
+            assignments['status'] = f'CASE WHEN {kept} THEN tasks.status ELSE s.status END'
+            assignments['completion_timestamp'] = (
+                f'CASE WHEN {kept} THEN tasks.completion_timestamp ELSE s.completion_timestamp END')
+        c.execute(f'''
+            UPDATE {section}
+            SET {", ".join(f"{col} = {value}" for col, value in assignments.items())},
+                content_hash = s.content_hash
+            FROM temp.merge_plan p JOIN {staged} s ON s.seq = p.seq
+            WHERE p.op = '~' AND {section}.id = p.id
+        ''')
+
+        last_id = c.execute(f'SELECT COALESCE(MAX(id), 0) FROM {section}').fetchone()[0]
+        if section == 'tasks' and self.has_fts:
+            c.execute('INSERT INTO tasks_fts_paused (paused) VALUES (1)')
+        c.execute(f'''
+            INSERT INTO {section} ({", ".join(columns)}, external_key, content_hash)
+            SELECT {", ".join(f"s.{col}" for col in columns)}, s.external_key, s.content_hash
+            FROM temp.merge_plan p JOIN {staged} s ON s.seq = p.seq
+            WHERE p.op = '+' ORDER BY p.seq
+        ''')
+        links = self._link_columns(section)
+        if links:
+            c.execute(f'''
+                UPDATE {section}
+                SET {", ".join(f"{col} = s.{col}" for col in links)}, content_hash = s.content_hash
+                FROM temp.merge_plan p JOIN {staged} s ON s.seq = p.seq
+                WHERE p.op = '>' AND p.ref IS NULL AND {section}.id = p.id
+            ''')
+        for column in links:
+            c.execute(f'''
+                UPDATE {section} SET {column} = s.{column}
+                FROM temp.merge_plan p JOIN {staged} s ON s.seq = p.seq
+                WHERE p.op = '>' AND p.ref = ? AND {section}.id = p.id
+            ''', (column,))
+        if section == 'tasks':
+            # AUTOINCREMENT: every new row has an id above last_id
+            c.execute(f'''
+                DELETE FROM task_resources WHERE task_id IN (SELECT id FROM temp.merge_plan WHERE op = '~')
+            ''')
+            c.execute(f'''
+                INSERT INTO task_resources (task_id, position, resource)
+                SELECT t.id, r.key, r.value
+                FROM tasks t JOIN {staged} s ON s.external_key = t.external_key, json_each(s.resources) r
+                WHERE t.id > ? OR t.id IN (SELECT id FROM temp.merge_plan WHERE op = '~')
+            ''', (last_id,))
+            if self.has_fts:
+                c.execute('DELETE FROM tasks_fts_paused')
+                c.execute('''
+                    INSERT INTO tasks_fts (rowid, title, description)
+                    SELECT id, title, description FROM tasks WHERE id > ?
+                ''', (last_id,))
+            self._refresh_statuses(c)
+
+        updated = planned.get('~', 0) + planned.get('>', 0)
+        return {
+            'inserted': planned.get('+', 0),
+            'updated': updated,
+            'deleted': planned.get('-', 0),
+            'unchanged': staged_count - planned.get('+', 0) - updated,
+            'examples': examples,
+        }
+
+    @staticmethod
+    def _unlink_removed(c, referrer, column, cleared):
+        # Clears the columns of referrer rows whose column points at a row
+        # being removed, noting each cleared reference in temp.merge_unlinked
+        removed = "(SELECT id FROM temp.merge_plan WHERE op = '-')"
+        for col in cleared:
+            c.execute(f'''
+                INSERT INTO temp.merge_unlinked (tbl, col, id)
+                SELECT ?, ?, id FROM {referrer} WHERE {column} IN {removed} AND {col} IS NOT NULL
+            ''', (referrer, col))
+        c.execute(f'''
+            UPDATE {referrer} SET {", ".join(f"{col} = NULL" for col in cleared)}
+            WHERE {column} IN {removed}
+        ''')
+
+    def _adopt_local_rows(self, c, section, key_prefix):
+        # Keyless rows (created in the app, or by a replacing import) whose
+        # derived key matches a staged item that no row holds yet take that key.
+        _columns, natural, _label = self._MERGE_SECTIONS[section]
+        rows = c.connection.execute(
+            f'SELECT id, {", ".join(natural)} FROM {section} WHERE external_key IS NULL ORDER BY id')
+        occurrences = collections.Counter()
+
+        def keyed():
+            for row in rows:
+                occurrences[row[1:]] += 1
+                yield row[0], key_prefix + self._derived_key(row[1:], occurrences[row[1:]])
+
+        c.execute('CREATE TEMP TABLE merge_local (id INTEGER PRIMARY KEY, external_key TEXT)')
+        c.executemany('INSERT INTO temp.merge_local (id, external_key) VALUES (?, ?)', keyed())
+        c.execute(f'''
+            UPDATE {section} SET external_key = l.external_key
+            FROM temp.merge_local l
+            WHERE {section}.id = l.id
+              AND l.external_key IN (SELECT external_key FROM temp.merge_{section})
+              AND l.external_key NOT IN (
+                  SELECT external_key FROM {section} WHERE external_key IS NOT NULL)
+        ''')
+        c.execute('DROP TABLE temp.merge_local')
+
+    # -----------------------------
+    #         EXPORT
+    # -----------------------------
+    EXPORT_BATCH = 1000
+    EXPORT_SECTIONS = ('tasks', 'phases', 'objectives')
+    # Key order of an exported task, as exports have always written it
+    EXPORT_TASK_FIELDS = ('id', 'phase_id', 'objective_id', 'title', 'description', 'date', 'status',
+                          'resources', 'recurring', 'priority', 'category', 'estimated_time',
+                          'completion_timestamp')
+
+    def iter_export(self, progress=None, cancel=None, batch_size=EXPORT_BATCH):
+        """
+        Streams the whole schedule as (section, dict) pairs in EXPORT_SECTIONS
+        order: every task with its 'resources' list (by id, keys in
+        EXPORT_TASK_FIELDS order), then every phase (by phase number), then
+        every objective (by id). Phases and objectives have the same shape as
+        get_phases() and get_objectives(). Rows are read with fetchmany,
+        `batch_size` at a time, inside one read transaction. progress/cancel
+        work as in _tracked().
+        """
+        with self.read_transaction() as conn:
+            c = conn.cursor()
+            total = sum(c.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                        for table in self.EXPORT_SECTIONS)
+            yield from self._tracked(self._export_rows(conn, batch_size), progress, cancel, total)
+
+    def _export_rows(self, conn, batch_size):
+        queries = (
+            # Resources come along as one JSON array per task, in position order
+            ('tasks', f'''
+                SELECT {self._TASK_COLUMNS},
+                       (SELECT json_group_array(resource) FROM (
+                            SELECT resource FROM task_resources
+                            WHERE task_id = tasks.id ORDER BY position))
+                FROM tasks ORDER BY id
+            ''', self._export_task),
+            ('phases', f'SELECT {self._PHASE_COLUMNS} FROM phases ORDER BY phase_number, id',
+             lambda r: PhaseRow(r).to_dict()),
+            ('objectives', f'SELECT {self._OBJECTIVE_COLUMNS} FROM objectives ORDER BY id',
+             lambda r: ObjectiveRow(r).to_dict()),
+        )
+        for section, sql, to_dict in queries:
+            c = conn.cursor()
+            c.execute(sql)
+            while True:
+                rows = c.fetchmany(batch_size)
+                if not rows:
+                    break
+                for r in rows:
+                    yield section, to_dict(r)
+
+    def _export_task(self, r):
+        task = self._task_from_row(r)
+        task['resources'] = json.loads(r[-1])
+        return {field: task[field] for field in self.EXPORT_TASK_FIELDS}
+
+    def _tracked(self, items, progress, cancel, total=None):
+        """
+        Yields `items`, calling progress(done, total) every PROGRESS_EVERY items
+        and once at the end; total is len(items) when it has one. `cancel` is a
+        CancelToken checked at the same points, raising Cancelled.
+        """
+        if hasattr(items, '__len__'):
+            total = len(items)
+        done = 0
+        for item in items:
+            if done % self.PROGRESS_EVERY == 0:
+                if cancel is not None:
+                    cancel.check()
+                if progress is not None:
+                    progress(done, total)
+            yield item
+            done += 1
+        if cancel is not None:
+            cancel.check()
+        if progress is not None:
+            progress(done, total)
+
+
+# =================================================================
+#                      SCHEDULE FILES
+# =================================================================
+
+@contextlib.contextmanager
+def open_schedule_file(filename, mode='r', newline=None):
+    """
+    Opens a schedule file as UTF-8 text for streaming reads (mode 'r') or
+    writes ('w'), (de)compressing '.gz' files on the fly. Yields
+    (text_file, raw_file); raw_file.tell() is the position in the file on
+    disk, e.g. for progress. Writes go to '<filename>.part', renamed over
+    `filename` only once the block completes, so a failed or cancelled
+    export never leaves a truncated file behind.
+    """
+    path = filename + '.part' if mode == 'w' else filename
+    try:
+        with open(path, mode + 'b') as raw:
+            stream = (gzip.GzipFile(fileobj=raw, mode=mode + 'b') if filename.endswith('.gz')
+                      else raw)
+            with io.TextIOWrapper(stream, encoding='utf-8', newline=newline) as text:
+                yield text, raw
+    except BaseException:
+        if mode == 'w' and os.path.exists(path):
+            os.remove(path)
+        raise
+    if mode == 'w':
+        os.replace(path, filename)
+
+
+def write_json_arrays(fp, keys, pairs, indent=4):
+    """
+    Streaming counterpart of iter_json_arrays(): writes {key: [items], ...}
+    for each of `keys`, taking the items from (key, item) pairs that are
+    grouped in `keys` order, one item at a time. The output is the same as
+    json.dump(..., indent=indent); indent=None writes compact JSON.
+    """
+    if indent is None:
+        outer = inner = ''
+        colon = ':'
+
+        def dumps(item):
+            return json.dumps(item, separators=(',', ':'))
+    else:
+        outer = '\n' + ' ' * indent
+        inner = outer + ' ' * indent
+        colon = ': '
+
+        def dumps(item):
+            return json.dumps(item, indent=indent).replace('\n', inner)
+
+    groups = itertools.groupby(pairs, key=lambda pair: pair[0])
+    group = next(groups, None)
+    fp.write('{')
+    for i, key in enumerate(keys):
+        fp.write((',' if i else '') + outer + json.dumps(key) + colon + '[')
+        count = 0
+        if group is not None and group[0] == key:
+            for _, item in group[1]:
+                fp.write((',' if count else '') + inner + dumps(item))
+                count += 1
+            group = next(groups, None)
+        fp.write((outer if count else '') + ']')
+    fp.write(('\n' if indent is not None else '') + '}')
+
+
+def format_merge_summary(summary):
+    """Readable report of an ArcanaeumDB.merge_schedule_stream() result."""
+    if not summary:
+        return "Nothing to merge."
+    counted = {'+': 'inserted', '~': 'updated', '-': 'deleted'}
+    lines = []
+    for section, result in summary.items():
+        lines.append(f"{section}: {result['inserted']} new, {result['updated']} changed, "
+                     f"{result['deleted']} removed, {result['unchanged']} unchanged")
+        for op, name in counted.items():
+            shown = [label for example_op, label in result['examples'] if example_op == op]
+            lines.extend(f"  {op} {label}" for label in shown)
+            if result[name] > len(shown):
+                lines.append(f"  {op} ... and {result[name] - len(shown)} more")
+        if result.get('unresolved'):
+            lines.append(f"  ! {result['unresolved']} references to phases/objectives "
+                         f"missing from the file were cleared")
+    return '\n'.join(lines)
+
+
+def iter_json_arrays(fp, chunk_size=1 << 16, on_chunk=None):
+    """
+    Streams a JSON document whose top level is an object of arrays, such as
+    {"phases": [...], "objectives": [...], "tasks": [...]}, yielding
+    (key, element) for each array element in file order. Only the element
+    being decoded is held in memory, whatever the size of the file. Top-level
+    values that are not arrays are read and skipped. on_chunk(), if given, is
+    called after each read from `fp`. Raises ValueError on malformed input.
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = fp.read(chunk_size)
+        if on_chunk is not None:
+            on_chunk()
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def peek():
+        # Next non-whitespace character, or '' at end of input
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ''
+
+    def expect(char):
+        nonlocal pos
+        if peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {pos} of the current chunk")
+        pos += 1
+
+    def value():
+        nonlocal pos
+        while True:
+            peek()
+            try:
+                result, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Most likely cut off at the chunk boundary; read on and retry
+                if not eof and fill():
+                    continue
+                raise
+            # Numbers are the one value without a closing delimiter: one that
+            # runs to the end of the buffer ('12', '1.', '3e') may continue
+            # in the next chunk
+            if (not eof and type(result) in (int, float)
+                    and not buf[end:].lstrip('0123456789.eE+-') and fill()):
+                continue
+            pos = end
+            return result
+
+    expect('{')
+    if peek() == '}':
+        return
+    while True:
+        key = value()
+        if not isinstance(key, str):
+            raise ValueError("Expected an object key")
+        expect(':')
+        if peek() == '[':
+            pos += 1
+            if peek() == ']':
+                pos += 1
+            else:
+                while True:
+                    yield key, value()
+                    char = peek()
+                    pos += 1
+                    if char == ']':
+                        break
+                    if char != ',':
+                        raise ValueError(f"Expected ',' or ']' in {key!r}")
+        else:
+            value()
+        char = peek()
+        pos += 1
+        if char == '}':
+            return
+        if char != ',':
+            raise ValueError("Expected ',' or '}' between top-level keys")
+
+
+# iCalendar (RFC 5545) import: events become tasks. A weekly series maps onto
+# one recurring ('Repeat Weekly') task per weekday; other series are expanded
+# into one task per occurrence within ICS_PAST_DAYS before and ICS_FUTURE_DAYS
+# after today.
+ICS_PAST_DAYS = 30
+ICS_FUTURE_DAYS = 365
+
+_ICS_WEEKDAYS = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+_ICS_ESCAPE = re.compile(r'\\([\\;,nN])')
+_ICS_DURATION = re.compile(r'([+-]?)P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+
+
+def iter_ics_events(fp, chunk_size=1 << 16, on_chunk=None):
+    """
+    Streams the VEVENTs of an iCalendar file, yielding one
+    {NAME: [(params, value), ...]} dict per event with folded lines joined
+    and values left raw; components nested in an event (VALARM) are
+    skipped. Only the current event is held in memory. on_chunk() works as
+    in iter_json_arrays().
+    """
+    event = None
+    depth = 0
+    for line in _ics_unfolded(_ics_lines(fp, chunk_size, on_chunk)):
+        name, params, value = _ics_property(line)
+        if name == 'BEGIN':
+            if event is not None:
+                depth += 1
+            elif value.upper() == 'VEVENT':
+                event = {}
+        elif name == 'END':
+            if depth:
+                depth -= 1
+            elif event is not None:
+                yield event
+                event = None
+        elif event is not None and not depth:
+            event.setdefault(name, []).append((params, value))
+
+
+def _ics_lines(fp, chunk_size, on_chunk):
+    rest = ''
+    while True:
+        chunk = fp.read(chunk_size)
+        if on_chunk is not None:
+            on_chunk()
+        if not chunk:
+            break
+        *lines, rest = (rest + chunk).split('\n')
+        yield from lines
+    if rest:
+        yield rest
+
+
+def _ics_unfolded(lines):
+    # A line starting with a space or tab continues the previous one
+    pending = None
+    for line in lines:
+        line = line.rstrip('\r')
+        if line[:1] in (' ', '\t') and pending is not None:
+            pending += line[1:]
+            continue
+        if pending:
+            yield pending
+        pending = line
+    if pending:
+        yield pending
+
+
+def _ics_property(line):
+    # NAME;PARAM=a;PARAM="b:c":value -> ('NAME', {'PARAM': ...}, 'value')
+    colon = line.find(':')
+    if '"' in line[:colon]:
+        quoted = False
+        for i, char in enumerate(line):
+            if char == '"':
+                quoted = not quoted
+            elif char == ':' and not quoted:
+                colon = i
+                break
+        else:
+            colon = -1
+    if colon < 0:
+        return line.upper(), {}, ''
+    name, *params = line[:colon].split(';')
+    params = dict(param.split('=', 1) for param in params if '=' in param)
+    return name.upper(), {key.upper(): value.strip('"') for key, value in params.items()}, line[colon + 1:]
+
+
+def _ics_text(event, name, default=''):
+    values = event.get(name)
+    if not values:
+        return default
+    return _ICS_ESCAPE.sub(lambda m: '\n' if m.group(1) in 'nN' else m.group(1), values[0][1])
+
+
+def _ics_datetime(params, value):
+    """A DATE as datetime.date, a DATE-TIME as a naive local datetime.datetime."""
+    value = value.strip()
+    if 'T' not in value or params.get('VALUE') == 'DATE':
+        return datetime.datetime.strptime(value[:8], '%Y%m%d').date()
+    moment = datetime.datetime.strptime(value[:15], '%Y%m%dT%H%M%S')
+    if value.endswith('Z'):
+        moment = moment.replace(tzinfo=datetime.timezone.utc).astimezone().replace(tzinfo=None)
+    # TZID times are kept as the wall-clock time of their zone
+    return moment
+
+
+def _ics_day(moment):
+    return moment.date() if isinstance(moment, datetime.datetime) else moment
+
+
+def _ics_minutes(event, start):
+    # Length of a timed event from DTEND or DURATION; None for all-day events
+    if not isinstance(start, datetime.datetime):
+        return None
+    if event.get('DTEND'):
+        end = _ics_datetime(*event['DTEND'][0])
+        if isinstance(end, datetime.datetime):
+            return round((end - start).total_seconds() / 60)
+    elif event.get('DURATION'):
+        m = _ICS_DURATION.match(event['DURATION'][0][1].strip())
+        if m:
+            weeks, days, hours, minutes, seconds = (int(part or 0) for part in m.groups()[1:])
+            return ((weeks * 7 + days) * 24 + hours) * 60 + minutes + round(seconds / 60)
+    return None
+
+
+def _format_minutes(minutes):
+    hours, minutes = divmod(minutes, 60)
+    return ''.join(part for part in (f"{hours}h" if hours else '', f"{minutes}m" if minutes else ''))
+
+
+def _ics_occurrences(start, rule, since, end):
+    """
+    Dates of an RRULE series starting on `start`, in order, from `since` up to
+    `end`. Without a COUNT, periods before `since` are skipped rather than
+    walked, so a series that began years ago costs no more than a new one.
+    Handles FREQ=DAILY/WEEKLY/MONTHLY/YEARLY with INTERVAL, COUNT, UNTIL,
+    plain BYDAY (daily/weekly) and BYMONTHDAY (monthly); returns None for any
+    other rule.
+    """
+    freq = rule.get('FREQ')
+    allowed = {'FREQ', 'INTERVAL', 'COUNT', 'UNTIL', 'WKST'}
+    allowed |= {'DAILY': {'BYDAY'}, 'WEEKLY': {'BYDAY'}, 'MONTHLY': {'BYMONTHDAY'}, 'YEARLY': set()}.get(freq, set())
+    try:
+        if freq is None or set(rule) - allowed:
+            raise ValueError(rule)
+        interval = int(rule.get('INTERVAL', 1))
+        count = int(rule['COUNT']) if 'COUNT' in rule else None
+        until = _ics_day(_ics_datetime({}, rule['UNTIL'])) if 'UNTIL' in rule else None
+        weekdays = sorted({_ICS_WEEKDAYS[day] for day in rule['BYDAY'].split(',')}) if 'BYDAY' in rule else None
+        monthdays = [int(day) for day in rule.get('BYMONTHDAY', str(start.day)).split(',')]
+    except (KeyError, ValueError):
+        return None
+    if interval < 1:
+        return None
+
+    # Periods to jump over: all those wholly before `since` (COUNT needs them counted)
+    skip = 0
+    if count is None and since > start:
+        days_before = (since - start).days
+        skip = {'DAILY': days_before // interval,
+                'WEEKLY': (days_before + start.weekday()) // 7 // interval,
+                'MONTHLY': ((since.year - start.year) * 12 + since.month - start.month) // interval,
+                'YEARLY': (since.year - start.year) // interval}[freq]
+
+    def candidates():
+        # Every date the rule matches from the first period kept; stops once a
+        # period starts after `end`
+        if freq == 'DAILY':
+            day = start + datetime.timedelta(days=skip * interval)
+            while day <= end:
+                if weekdays is None or day.weekday() in weekdays:
+                    yield day
+                day += datetime.timedelta(days=interval)
+        elif freq == 'WEEKLY':
+            week = start - datetime.timedelta(days=start.weekday()) + datetime.timedelta(weeks=skip * interval)
+            while week <= end:
+                for weekday in weekdays or [start.weekday()]:
+                    day = week + datetime.timedelta(days=weekday)
+                    if day >= start:
+                        yield day
+                week += datetime.timedelta(weeks=interval)
+        elif freq == 'MONTHLY':
+            months = start.month - 1 + skip * interval
+            year, month = start.year + months // 12, months % 12 + 1
+            while datetime.date(year, month, 1) <= end:
+                last = (datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)).day
+                for monthday in sorted(d if d > 0 else last + d + 1 for d in monthdays):
+                    if 1 <= monthday <= last and datetime.date(year, month, monthday) >= start:
+                        yield datetime.date(year, month, monthday)
+                year, month = year + (month - 1 + interval) // 12, (month - 1 + interval) % 12 + 1
+        else:
+            year = start.year + skip * interval
+            while year <= end.year:
+                # Skips 29 February outside leap years
+                with contextlib.suppress(ValueError):
+                    yield start.replace(year=year)
+                year += interval
+
+    def occurrences():
+        for n, day in enumerate(candidates(), 1):
+            if (until is not None and day > until) or day > end:
+                return
+            if day >= since:
+                yield day
+            if n == count:
+                return
+
+    return occurrences()
+
+
+def ics_overrides(events):
+    """
+    Maps each UID to the original dates of its RECURRENCE-ID overrides.
+    Overrides may come before or after their series in the file, so this
+    is collected in a first pass and handed to ics_event_tasks().
+    """
+    overridden = {}
+    for event in events:
+        uid = _ics_text(event, 'UID')
+        if uid and event.get('RECURRENCE-ID'):
+            overridden.setdefault(uid, set()).add(_ics_day(_ics_datetime(*event['RECURRENCE-ID'][0])))
+    return overridden
+
+
+def ics_event_tasks(events, today=None, overridden=None):
+    """
+    Turns iter_ics_events() events into task dicts for
+    ArcanaeumDB.merge_schedule_stream(), keyed by UID: one task per plain
+    event (UID/<date> for a RECURRENCE-ID override), one recurring task per
+    weekday of an open-ended weekly series still running today
+    (UID#<weekday>), dated at its next occurrence, and one task per
+    occurrence within the import window for any other series (UID/<date>).
+    Cancelled events, EXDATEs and the dates in overridden (see
+    ics_overrides) are skipped; a rule that cannot be expanded keeps its
+    first occurrence.
+    """
+    today = today or datetime.date.today()
+    overridden = overridden or {}
+    window_start = today - datetime.timedelta(days=ICS_PAST_DAYS)
+    window_end = today + datetime.timedelta(days=ICS_FUTURE_DAYS)
+    for event in events:
+        if _ics_text(event, 'STATUS').upper() == 'CANCELLED':
+            continue
+        start = _ics_datetime(*event['DTSTART'][0]) if event.get('DTSTART') else today
+        day = _ics_day(start)
+        minutes = _ics_minutes(event, start)
+        uid = _ics_text(event, 'UID') or None
+        task = {
+            'phase_id': None,
+            'objective_id': None,
+            'title': _ics_text(event, 'SUMMARY', 'No Title'),
+            'description': _ics_text(event, 'DESCRIPTION'),
+            'status': 'Pending',
+            'resources': [text for text in (_ics_text(event, 'LOCATION'), _ics_text(event, 'URL')) if text],
+            'recurring': False,
+            'priority': 'Medium',
+            'category': 'General',
+            'estimated_time': _format_minutes(minutes) if minutes and minutes > 0 else '',
+            'completion_timestamp': '',
+        }
+
+        def dated(date, key_suffix='', recurring=False):
+            return dict(task, date=date.isoformat(), recurring=recurring,
+                        external_key=uid and uid + key_suffix)
+
+        rule = None
+        if event.get('RRULE'):
+            rule = dict(part.split('=', 1) for part in event['RRULE'][0][1].upper().split(';') if '=' in part)
+        if event.get('RECURRENCE-ID'):
+            original = _ics_day(_ics_datetime(*event['RECURRENCE-ID'][0]))
+            yield dated(day, f"/{original:%Y%m%d}")
+            continue
+        occurrences = _ics_occurrences(day, rule, window_start, window_end) if rule else None
+        if occurrences is None:
+            yield dated(day)
+            continue
+        excluded = {_ics_day(_ics_datetime(params, value))
+                    for params, values in event.get('EXDATE', ())
+                    for value in values.split(',')}
+        excluded |= overridden.get(uid, set())
+        if (rule['FREQ'] == 'WEEKLY' and int(rule.get('INTERVAL', 1)) == 1
+                and 'UNTIL' not in rule and 'COUNT' not in rule):
+            # The next occurrence on each of the series' weekdays, if it is still running
+            weekdays = ({_ICS_WEEKDAYS[code] for code in rule['BYDAY'].split(',')} if 'BYDAY' in rule
+                        else {day.weekday()})
+            upcoming = {}
+            for d in _ics_occurrences(day, rule, today, window_end):
+                if d not in excluded:
+                    upcoming.setdefault(d.weekday(), d)
+                    if len(upcoming) == len(weekdays):
+                        break
+            if upcoming:
+                by_weekday = len(upcoming) > 1 or 'BYDAY' in rule
+                weekday_codes = {n: code for code, n in _ICS_WEEKDAYS.items()}
+                for weekday, d in sorted(upcoming.items()):
+                    yield dated(d, f"#{weekday_codes[weekday]}" if by_weekday else '', recurring=True)
+                continue
+        for d in occurrences:
+            if d not in excluded:
+                yield dated(d, f"/{d:%Y%m%d}")
+
+
+# =================================================================
+#                      SEARCH CONTROLLER
+# =================================================================
+
+class SearchController:
+    """
+    Drives the main window's task list from the search box.
+      - Text changes are debounced with after(); a newer change cancels the
+        pending query instead of queueing another one.
+      - Without search text, or when a search matches more than NARROW_LIMIT
+        tasks, the list pages straight from the DB.
+      - Smaller result sets are kept in memory; when the new query extends
+        the previous one (and no other filter or data changed), that set is
+        narrowed instead of querying again.
+    """
+
+    DELAY_MS = 200
+    NARROW_LIMIT = 2000     # most matches held in memory for narrowing
+
+    def __init__(self, app, variable, delay_ms=DELAY_MS):
+        self.app = app
+        self.variable = variable
+        self.delay_ms = delay_ms
+        self._after_id = None
+        self._last_query = None
+        self._last_filters = None
+        self._last_results = None
+        self._current = False
+        variable.trace_add('write', self._on_change)
+
+    def _on_change(self, *args):
+        self._cancel_pending()
+        self._after_id = self.app.after(self.delay_ms, self._run)
+
+    def _cancel_pending(self):
+        if self._after_id is not None:
+            self.app.after_cancel(self._after_id)
+            self._after_id = None
+
+    def run_now(self, seed=None):
+        """Runs the pending (or current) query immediately."""
+        self._cancel_pending()
+        self._run(seed)
+
+    def refresh(self, seed=None):
+        """
+        Drops cached results and re-queries; use after writes or filter changes.
+        `seed` (see Arcanaeum.show_query) supplies already-read rows for it.
+        """
+        self._current = False
+        self.run_now(seed)
+
+    def _run(self, seed=None):
+        self._after_id = None
+        filters = self.app.current_filters()
+        query = filters.get('search', '')
+
+        if self._current and filters == self._last_filters:
+            return
+        # Re-showing the same filters (e.g. after an edit) keeps scroll and selection
+        keep_position = filters == self._last_filters
+        results = None
+        if query:
+            if self._can_narrow(query, filters):
+                needle = query.lower()
+                results = [t for t in self._last_results
+                           if needle in (t['title'] or '').lower()
+                           or needle in (t['description'] or '').lower()]
+            else:
+                # Reads at most one row past the limit to tell a small result set
+                results = self.app.db.query_tasks(filters, compact=True, limit=self.NARROW_LIMIT + 1)
+                if len(results) > self.NARROW_LIMIT:
+                    results = None
+        if results is None:
+            # Page straight from the DB
+            self.app.show_query(filters, keep_position=keep_position, seed=seed)
+        else:
+            self.app.show_tasks(results, keep_position=keep_position)
+
+        self._last_query = query
+        self._last_filters = filters
+        self._last_results = results
+        self._current = True
+
+    def _can_narrow(self, query, filters):
+        if not self._current or self._last_results is None or not self._last_query:
+            return False
+        if self._last_query not in query:
+            return False
+        # Every filter other than the search text must be unchanged
+        previous = dict(self._last_filters)
+        current = dict(filters)
+        previous.pop('search', None)
+        current.pop('search', None)
+        return previous == current
+
+
+# =================================================================
+#                   VIRTUALIZED TASK LIST
+# =================================================================
+
+def plan_tree_updates(old_order, old_values, new_order, new_values):
+    """
+    Computes the Treeview calls that turn the rows `old_order` (iids, top to
+    bottom, showing `old_values[iid]`) into `new_order`/`new_values`:
+      ('delete', [iid, ...])          one call for every row that went away
+      ('insert', index, iid, values)  rows that are new
+      ('item', iid, values)           kept rows whose values changed
+      ('move', iid, index)            kept rows that changed position
+    Unchanged rows produce no calls at all.
+    """
+    new_set = set(new_order)
+    ops = []
+    gone = [iid for iid in old_order if iid not in new_set]
+    if gone:
+        ops.append(('delete', gone))
+    current = [iid for iid in old_order if iid in new_set]
+    present = set(current)
+    for index, iid in enumerate(new_order):
+        values = new_values[iid]
+        if iid not in present:
+            ops.append(('insert', index, iid, values))
+            current.insert(index, iid)
+            present.add(iid)
+            continue
+        if old_values.get(iid) != values:
+            ops.append(('item', iid, values))
+        if current[index] != iid:
+            ops.append(('move', iid, index))
+            current.remove(iid)
+            current.insert(index, iid)
+    return ops
+
+
+class VirtualTaskList(ttk.Frame):
+    """
+    A Treeview that only ever holds the rows currently in view.
+
+    The rows come from a source given to set_source(): the total row count and
+    a fetch(offset, limit) callable (a paged ArcanaeumDB query, or a slice of
+    an in-memory list). Rows are fetched PAGE_SIZE at a time and a few pages
+    are cached; the neighbouring page is prefetched once the view is within
+    OVERSCAN rows of it. Scrolling (scrollbar, wheel, keys) moves a window
+    offset instead of letting the Treeview scroll, so widget cost stays flat
+    however many tasks match. Item iids are task ids, and selection survives
+    scrolling rows out of view. Re-rendering reconciles the tree against the
+    new window (plan_tree_updates), so a one-row change costs one Tk call.
+    """
+
+    PAGE_SIZE = 100
+    OVERSCAN = 20
+    MAX_CACHED_PAGES = 8
+
+    def __init__(self, parent, columns, format_row):
+        super().__init__(parent)
+        self.format_row = format_row
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=20)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self._fetch = None
+        self._total = 0
+        self._offset = 0
+        self._visible = 20
+        self._row_height = None
+        self._header_height = 0
+        self._pages = collections.OrderedDict()
+        self._rendered = []      # iids currently in the tree, top to bottom
+        self._values = {}        # iid -> values currently shown for it
+        self._selected = []      # selected iids, including rows scrolled out of view
+
+        self.tree.bind('<Configure>', self._on_configure)
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.tree.bind('<Button-1>', self._on_plain_click)
+        # Modified clicks extend the selection; keep <Button-1> from seeing them
+        self.tree.bind('<Control-Button-1>', lambda e: None)
+        self.tree.bind('<Shift-Button-1>', lambda e: None)
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda e: self._scroll_rows(-3))
+        self.tree.bind('<Button-5>', lambda e: self._scroll_rows(3))
+        self.tree.bind('<Up>', lambda e: self._move_focus(-1))
+        self.tree.bind('<Down>', lambda e: self._move_focus(1))
+        self.tree.bind('<Prior>', lambda e: self._move_focus(-self._visible))
+        self.tree.bind('<Next>', lambda e: self._move_focus(self._visible))
+        self.tree.bind('<Home>', lambda e: self._move_focus(-self._total))
+        self.tree.bind('<End>', lambda e: self._move_focus(self._total))
+
+    # -----------------------------
+    #         SOURCE
+    # -----------------------------
+    def set_source(self, total, fetch, keep_position=False):
+        """
+        Shows `total` rows obtained through fetch(offset, limit).
+        With keep_position the scroll offset and selection are preserved
+        (used when refreshing the same view after an edit).
+        """
+        self._total = total
+        self._fetch = fetch
+        self._pages.clear()
+        if not keep_position:
+            self._offset = 0
+            self._selected = []
+        self._render()
+
+    def set_rows(self, rows, keep_position=False):
+        """Convenience source for an in-memory list of rows."""
+        self.set_source(len(rows), lambda offset, limit: rows[offset:offset + limit], keep_position)
+
+    def selection(self):
+        """Selected task iids, like Treeview.selection() but including off-screen rows."""
+        return tuple(self._selected)
+
+    def deselect(self, *iids):
+        """Drops rows from the selection, e.g. tasks that were just deleted."""
+        self._selected = [iid for iid in self._selected if iid not in iids]
+
+    # -----------------------------
+    #         PAGING
+    # -----------------------------
+    def _page(self, index):
+        page = self._pages.get(index)
+        if page is None:
+            page = list(self._fetch(index * self.PAGE_SIZE, self.PAGE_SIZE))
+            self._pages[index] = page
+            while len(self._pages) > self.MAX_CACHED_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(index)
+        return page
+
+    def _rows(self, offset, count):
+        rows = []
+        end = min(offset + count, self._total)
+        i = offset
+        while i < end:
+            index, start = divmod(i, self.PAGE_SIZE)
+            page = self._page(index)
+            take = page[start:start + (end - i)]
+            if not take:
+                break
+            rows.extend(take)
+            i += len(take)
+        return rows
+
+    def _prefetch(self):
+        if self._fetch is None or not self._total:
+            return
+        last_page = (self._total - 1) // self.PAGE_SIZE
+        for row in (self._offset - self.OVERSCAN, self._offset + self._visible + self.OVERSCAN):
+            index = min(max(row, 0), self._total - 1) // self.PAGE_SIZE
+            if 0 <= index <= last_page and index not in self._pages:
+                self._page(index)
+
+    # -----------------------------
+    #         RENDERING
+    # -----------------------------
+    def _render(self):
+        self._offset = max(0, min(self._offset, self._total - self._visible))
+        rows = self._rows(self._offset, self._visible) if self._fetch else []
+
+        new_order = []
+        new_values = {}
+        for row in rows:
+            iid = str(row['id'])
+            new_order.append(iid)
+            new_values[iid] = tuple(self.format_row(row))
+        self._apply(plan_tree_updates(self._rendered, self._values, new_order, new_values))
+        self._rendered = new_order
+        self._values = new_values
+
+        rendered = set(self._rendered)
+        in_view = [iid for iid in self._selected if iid in rendered]
+        # Also when empty: rows still in view must not keep a stale highlight
+        self.tree.selection_set(in_view)
+        self._update_scrollbar()
+        if self._row_height is None and self._rendered:
+            # Measure the real row height once the first rows are drawn
+            self.after_idle(lambda: self._fit_rows(self.tree.winfo_height()))
+        self.after_idle(self._prefetch)
+
+    def _apply(self, ops):
+        for op in ops:
+            if op[0] == 'delete':
+                self.tree.delete(*op[1])
+            elif op[0] == 'insert':
+                self.tree.insert('', op[1], iid=op[2], values=op[3])
+            elif op[0] == 'move':
+                self.tree.move(op[1], '', op[2])
+            else:
+                self.tree.item(op[1], values=op[2])
+
+    def _update_scrollbar(self):
+        if self._total <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        first = self._offset / self._total
+        last = min(1.0, (self._offset + self._visible) / self._total)
+        self.scrollbar.set(first, last)
+
+    def _on_configure(self, event):
+        self._fit_rows(event.height)
+
+    def _fit_rows(self, height):
+        if self._row_height is None and self._rendered:
+            bbox = self.tree.bbox(self._rendered[0])
+            if bbox:
+                self._header_height, self._row_height = bbox[1], bbox[3]
+        row_height = self._row_height or 20
+        # Whole rows only, so the Treeview itself never has anything to scroll
+        visible = max(1, (height - (self._header_height or 24)) // row_height)
+        if visible != self._visible:
+            self._visible = visible
+            self._render()
+
+    # -----------------------------
+    #         SCROLLING
+    # -----------------------------
+    def yview(self, *args):
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self._set_offset(int(float(args[1]) * self._total))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            self._scroll_rows(amount * self._visible if args[2] == 'pages' else amount)
+
+    def _on_wheel(self, event):
+        self._scroll_rows(-3 if event.delta > 0 else 3)
+        return 'break'
+
+    def _scroll_rows(self, amount):
+        self._set_offset(self._offset + amount)
+        return 'break'
+
+    def _set_offset(self, offset):
+        offset = max(0, min(offset, self._total - self._visible))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _move_focus(self, amount):
+        focus = self.tree.focus()
+        if focus in self._rendered:
+            position = self._offset + self._rendered.index(focus)
+        else:
+            position = self._offset
+        target = max(0, min(position + amount, self._total - 1))
+        if target < self._offset:
+            self._set_offset(target)
+        elif target >= self._offset + self._visible:
+            self._set_offset(target - self._visible + 1)
+        index = target - self._offset
+        if 0 <= index < len(self._rendered):
+            iid = self._rendered[index]
+            self._selected = [iid]
+            self.tree.selection_set(iid)
+            self.tree.focus(iid)
+        return 'break'
+
+    # -----------------------------
+    #         SELECTION
+    # -----------------------------
+    def _on_plain_click(self, event):
+        # A plain click on a row starts a new selection, dropping off-screen rows too
+        if self.tree.identify_region(event.x, event.y) in ('cell', 'tree'):
+            self._selected = []
+
+    def _on_select(self, event):
+        rendered = set(self._rendered)
+        kept = [iid for iid in self._selected if iid not in rendered]
+        self._selected = kept + list(self.tree.selection())
+
+
+# =================================================================
+#                      PAGED TREEVIEW
+# =================================================================
+
+class PagedTreeLoader:
+    """
+    Page-on-scroll filler for a plain ttk.Treeview (the manager/viewer
+    dialogs): the first page is loaded up front and the next one whenever the
+    view nears the bottom, so opening a dialog costs one page however long the
+    table is. `fetch(after, limit)` returns (rows, cursor) like the
+    ArcanaeumDB *_page methods; `values(row)` gives a row's column values and
+    row['id'] becomes its iid.
+    """
+
+    PAGE_SIZE = 100
+    LOAD_AT = 0.9   # fraction of the loaded rows scrolled past before the next page
+
+    def __init__(self, tree, scrollbar, fetch, values, page_size=PAGE_SIZE):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.fetch = fetch
+        self.values = values
+        self.page_size = page_size
+        self._cursor = None
+        self._exhausted = False
+        self._pending = None
+
+        tree.configure(yscrollcommand=self._on_yscroll)
+        scrollbar.configure(command=tree.yview)
+        self.reload()
+
+    def reload(self):
+        """
+        Drops the loaded rows and starts again from the first page.
+        """
+        if self._pending is not None:
+            self.tree.after_cancel(self._pending)
+            self._pending = None
+        self.tree.delete(*self.tree.get_children())
+        self._cursor = None
+        self._exhausted = False
+        self._load_more()
+
+    def _load_more(self):
+        self._pending = None
+        if self._exhausted or not self.tree.winfo_exists():
+            return
+        rows, cursor = self.fetch(self._cursor, self.page_size)
+        for row in rows:
+            self.tree.insert('', tk.END, iid=str(row['id']), values=self.values(row))
+        if cursor is not None:
+            self._cursor = cursor
+        self._exhausted = len(rows) < self.page_size
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(last) >= self.LOAD_AT and not self._exhausted and self._pending is None:
+            self._pending = self.tree.after_idle(self._load_more)
+
+
+# =================================================================
+#                      BACKGROUND WORKER
+# =================================================================
+
+class DBWorker:
+    """
+    Runs slow ArcanaeumDB work (imports, exports, statistics) off the Tk thread.
+      - submit() returns a concurrent.futures.Future. on_done(result) and
+        on_error(exc) are always called back on the Tk thread.
+      - A single worker thread runs jobs one at a time, in submission order,
+        on that thread's own connection (see ArcanaeumDB.get_connection).
+      - Worker-side code never touches Tk: results and progress go through a
+        queue that the Tk thread drains with after() while jobs are pending.
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, root):
+        self.root = root
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='arcanaeum-db')
+        self._calls = queue.SimpleQueue()
+        self._pending = 0
+        self._after_id = None
+        self._tokens = set()
+
+    def submit(self, fn, *args, on_done=None, on_error=None, **kwargs):
+        """
+        Runs fn(*args, **kwargs) on the worker thread. Without on_error, failures
+        are shown in a message box (a cancelled job is silently dropped).
+        """
+        future = self._executor.submit(fn, *args, **kwargs)
+        self._pending += 1
+        future.add_done_callback(
+            lambda f: self._calls.put(lambda: self._finish(f, on_done, on_error)))
+        self._schedule_poll()
+        return future
+
+    def run_with_progress(self, parent, title, fn, *args, on_done=None, on_error=None, **kwargs):
+        """
+        submit() behind a modal ProgressDialog. fn also receives progress= (a
+        thread-safe progress(done, total) callable) and cancel= (the dialog's
+        CancelToken) keyword arguments.
+        """
+        token = CancelToken()
+        dialog = ProgressDialog(parent, title, token)
+        self._tokens.add(token)
+
+        def progress(done, total):
+            self.call_in_tk(dialog.update_progress, done, total)
 
-    def delete_objective(self, objective_id):
+        def finish(callback, value):
+            self._tokens.discard(token)
+            dialog.destroy()
+            if callback is not None:
+                callback(value)
+
+        return self.submit(fn, *args, progress=progress, cancel=token,
+                           on_done=lambda result: finish(on_done, result),
+                           on_error=lambda exc: finish(on_error or self._report_error, exc),
+                           **kwargs)
+
+    def call_in_tk(self, fn, *args):
         """
-        Deleting an objective sets objective_id=NULL for tasks referencing it,
-        then removes the objective entry.
+        Queues fn(*args) to run on the Tk thread. Safe to call from a job.
         """
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
-        c.execute('UPDATE tasks SET objective_id=NULL WHERE objective_id=?', (objective_id,))
-        c.execute('DELETE FROM objectives WHERE id=?', (objective_id,))
-        conn.commit()
-        conn.close()
+        self._calls.put(lambda: fn(*args))
 
-    # -----------------------------
-    #         TASKS
-    # -----------------------------
-    def add_task(self, task):
+    def shutdown(self):
         """
-        task = {
-            'phase_id': ...,
-            'objective_id': ...,
-            'title': ...,
-            'description': ...,
-            'date': ...,
-            'status': ...,
-            'resources': [...],
-            'recurring': bool,
-            'priority': ...,
-            'category': ...,
-            'estimated_time': ...,
-            'completion_timestamp': ...
-        }
+        Cancels running jobs, drops queued ones and waits for the worker to stop.
         """
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
-        c.execute('''
-            INSERT INTO tasks (
-                phase_id, objective_id, title, description, date, status, resources, recurring,
-                priority, category, estimated_time, completion_timestamp
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''',
-                  (task.get('phase_id', None),
-                   task.get('objective_id', None),
-                   task['title'],
-                   task['description'],
-                   task['date'],
-                   task['status'],
-                   ','.join(task.get('resources', [])),
-                   1 if task.get('recurring', False) else 0,
-                   task.get('priority', 'Medium'),
-                   task.get('category', 'General'),
-                   task.get('estimated_time', ''),
-                   task.get('completion_timestamp', '')
-                  ))
-        conn.commit()
-        conn.close()
-
-    def get_tasks(self):
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
-        c.execute('''
-            SELECT
-                id, phase_id, objective_id, title, description, date, status, resources,
-                recurring, priority, category, estimated_time, completion_timestamp
-            FROM tasks
-        ''')
-        rows = c.fetchall()
-        conn.close()
-        tasks = []
-        for r in rows:
-            tasks.append({
-                'id': r[0],
-                'phase_id': r[1],
-                'objective_id': r[2],
-                'title': r[3],
-                'description': r[4],
-                'date': r[5],
-                'status': r[6],
-                'resources': r[7].split(',') if r[7] else [],
-                'recurring': bool(r[8]),
-                'priority': r[9],
-                'category': r[10],
-                'estimated_time': r[11],
-                'completion_timestamp': r[12]
-            })
-        return tasks
+        for token in list(self._tokens):
+            token.cancel()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _finish(self, future, on_done, on_error):
+        self._pending -= 1
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is None:
+            if on_done is not None:
+                on_done(future.result())
+        elif on_error is not None:
+            on_error(exc)
+        else:
+            self._report_error(exc)
 
-    def get_task_by_id(self, task_id):
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
-        c.execute('''
-            SELECT
-                id, phase_id, objective_id, title, description, date, status, resources,
-                recurring, priority, category, estimated_time, completion_timestamp
-            FROM tasks
-            WHERE id=?
-        ''', (task_id,))
-        r = c.fetchone()
-        conn.close()
-        if r:
-            return {
-                'id': r[0],
-                'phase_id': r[1],
-                'objective_id': r[2],
-                'title': r[3],
-                'description': r[4],
-                'date': r[5],
-                'status': r[6],
-                'resources': r[7].split(',') if r[7] else [],
-                'recurring': bool(r[8]),
-                'priority': r[9],
-                'category': r[10],
-                'estimated_time': r[11],
-                'completion_timestamp': r[12]
-            }
-        return None
+    @staticmethod
+    def _report_error(exc):
+        if not isinstance(exc, Cancelled):
+            messagebox.showerror("Error", str(exc))
 
-    def update_task(self, task_id, task):
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
-        c.execute('''
-            UPDATE tasks
-            SET phase_id=?, objective_id=?, title=?, description=?, date=?, status=?, resources=?,
-                recurring=?, priority=?, category=?, estimated_time=?, completion_timestamp=?
-            WHERE id=?
-        ''',
-                  (task.get('phase_id', None),
-                   task.get('objective_id', None),
-                   task['title'],
-                   task['description'],
-                   task['date'],
-                   task['status'],
-                   ','.join(task.get('resources', [])),
-                   1 if task.get('recurring', False) else 0,
-                   task.get('priority', 'Medium'),
-                   task.get('category', 'General'),
-                   task.get('estimated_time', ''),
-                   task.get('completion_timestamp', ''),
-                   task_id))
-        conn.commit()
-        conn.close()
+    def _schedule_poll(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.POLL_MS, self._poll)
 
-    def delete_task(self, task_id):
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
-        c.execute('DELETE FROM tasks WHERE id=?', (task_id,))
-        conn.commit()
-        conn.close()
+    def _poll(self):
+        self._after_id = None
+        try:
+            while True:
+                try:
+                    call = self._calls.get_nowait()
+                except queue.Empty:
+                    break
+                call()
+        finally:
+            # A callback that raises is reported by Tk; the rest still get run
+            if self._pending or not self._calls.empty():
+                self._schedule_poll()
 
-    # -----------------------------
-    #       REFLECTIONS
-    # -----------------------------
-    def add_reflection(self, content):
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
-        timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        c.execute('INSERT INTO reflections (timestamp, content) VALUES (?, ?)', (timestamp, content))
-        conn.commit()
-        conn.close()
 
-    def get_reflections(self):
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
-        c.execute('SELECT id, timestamp, content FROM reflections ORDER BY id DESC')
-        rows = c.fetchall()
-        conn.close()
-        result = []
-        for r in rows:
-            result.append({
-                'id': r[0],
-                'timestamp': r[1],
-                'content': r[2]
-            })
-        return result
+class ProgressDialog(tk.Toplevel):
+    """
+    Modal progress window for a DBWorker job: an indeterminate bar until the
+    job reports a total, and a Cancel button that sets the job's CancelToken.
+    """
 
-    def delete_reflection(self, reflection_id):
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
-        c.execute('DELETE FROM reflections WHERE id=?', (reflection_id,))
-        conn.commit()
-        conn.close()
+    def __init__(self, parent, title, token):
+        super().__init__(parent)
+        self.title(title)
+        self.transient(parent)
+        self.resizable(False, False)
+        self.token = token
+
+        self.status_var = tk.StringVar(value="Working...")
+        ttk.Label(self, textvariable=self.status_var).pack(anchor=tk.W, padx=10, pady=(10, 5))
+        self.bar = ttk.Progressbar(self, length=320, mode='indeterminate')
+        self.bar.pack(padx=10, pady=5)
+        self.bar.start(10)
+        self.cancel_button = ttk.Button(self, text="Cancel", command=self.cancel)
+        self.cancel_button.pack(pady=(5, 10))
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        self.grab_set()
+
+    def update_progress(self, done, total):
+        if self.token.cancelled:
+            return
+        if total:
+            if str(self.bar['mode']) != 'determinate':
+                self.bar.stop()
+                self.bar.configure(mode='determinate', maximum=total)
+            self.bar['value'] = done
+            self.status_var.set(f"{done:,} of {total:,}")
+        else:
+            self.status_var.set(f"{done:,} done")
+
+    def cancel(self):
+        self.token.cancel()
+        self.cancel_button.state(['disabled'])
+        self.status_var.set("Cancelling...")
 
 
 # =================================================================
@@ -415,20 +3076,26 @@ class ArcanaeumDB:
 # =================================================================
 
 class Arcanaeum(tk.Tk):
-    def __init__(self):
+    def __init__(self, db_file='arcanaeum.db'):
         super().__init__()
         self.title("Arcanaeum - The Personal Learning Navigator")
         self.geometry("1400x750")
 
-        # DB/Model
-        self.db = ArcanaeumDB()
+        # DB/Model; slow DB jobs go through self.worker
+        self.db = ArcanaeumDB(db_file)
+        self.worker = DBWorker(self)
 
         # Style
         self.style = ttk.Style(self)
         self.style.theme_use('clam')
 
-        # Filtered tasks in UI
-        self.filtered_tasks = []
+        # Current list sort: [(task field, descending), ...]
+        self.sort_order = []
+        self.phase_filter_ids = {}
+        self.objective_filter_ids = {}
+        self.phase_labels = {}
+        self.phase_numbers = {}
+        self.objective_labels = {}
 
         # Create UI
         self._create_menu()
@@ -436,13 +3103,34 @@ class Arcanaeum(tk.Tk):
         self._create_treeview()
         self._create_progress()
         self._create_buttons()
-        self.populate_tasks()
 
+        # Date-based statuses: once now, then at every local midnight
+        self.db.refresh_statuses()
+        self._schedule_midnight_refresh()
+
+        # One consistent read feeds the list, filters, progress and notifications
+        snapshot = self.db.get_startup_snapshot(VirtualTaskList.PAGE_SIZE)
+        self._refresh_filter_choices(snapshot['phases'], snapshot['objectives'])
+        self.search.refresh(seed={'total': sum(snapshot['status_counts'].values()),
+                                  'first_page': snapshot['first_page']})
+        self.update_progress(snapshot['status_counts'])
+
+        # Non-critical work waits until the window has been drawn
+        self.after_idle(lambda: self.after(0, self._after_first_paint, snapshot['due_today']))
+
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def _after_first_paint(self, due_today):
         # Weekly auto-check
         self.check_for_weekly_wrapup()
 
         # Optional notifications for tasks due today
-        self.notify_tasks_due_today()
+        self.notify_tasks_due_today(due_today)
+
+    def on_close(self):
+        self.worker.shutdown()
+        self.db.close()
+        self.destroy()
 
     # ----------------------------------------------------------
     #                   MENU BAR
@@ -455,13 +3143,15 @@ class Arcanaeum(tk.Tk):
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Import JSON", command=self.import_json)
+        file_menu.add_command(label="Import JSON (merge)", command=self.import_json_merge)
         file_menu.add_command(label="Export JSON", command=self.export_json)
-        if Calendar and Event:
-            file_menu.add_command(label="Import ICS", command=self.import_ics)
+        file_menu.add_command(label="Export JSON (compact)", command=lambda: self.export_json(compact=True))
+        file_menu.add_command(label="Import ICS", command=self.import_ics)
+        if HAS_ICALENDAR:
             file_menu.add_command(label="Export ICS", command=self.export_ics)
         file_menu.add_command(label="Export CSV", command=self.export_csv)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.quit)
+        file_menu.add_command(label="Exit", command=self.on_close)
 
         # View Menu
         view_menu = tk.Menu(menubar, tearoff=0)
@@ -509,7 +3199,9 @@ class Arcanaeum(tk.Tk):
         self.search_var = tk.StringVar()
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
         search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-        search_entry.bind("<KeyRelease>", self.on_search)
+        # The controller reacts to actual text changes only (not arrows/shift)
+        self.search = SearchController(self, self.search_var)
+        search_entry.bind("<Return>", lambda e: self.search.run_now())
         ttk.Button(search_frame, text="Clear", command=self.clear_search).pack(side=tk.LEFT, padx=5)
 
         # Category Filter
@@ -520,7 +3212,7 @@ class Arcanaeum(tk.Tk):
             values=["All", "Work", "Personal", "Study", "General"]
         )
         self.category_filter.pack(side=tk.LEFT)
-        self.category_filter.bind("<<ComboboxSelected>>", lambda e: self.populate_tasks())
+        self.category_filter.bind("<<ComboboxSelected>>", lambda e: self.search.refresh())
 
         # Priority Filter
         ttk.Label(search_frame, text="Priority Filter:").pack(side=tk.LEFT, padx=5)
@@ -530,32 +3222,36 @@ class Arcanaeum(tk.Tk):
             values=["All", "Low", "Medium", "High", "Critical"]
         )
         self.priority_filter.pack(side=tk.LEFT)
-        self.priority_filter.bind("<<ComboboxSelected>>", lambda e: self.populate_tasks())
+        self.priority_filter.bind("<<ComboboxSelected>>", lambda e: self.search.refresh())
 
         # Phase Filter
         ttk.Label(search_frame, text="Phase Filter:").pack(side=tk.LEFT, padx=5)
         self.phase_filter_var = tk.StringVar(value="All")
         self.phase_filter = ttk.Combobox(search_frame, textvariable=self.phase_filter_var)
         self.phase_filter.pack(side=tk.LEFT)
-        self.phase_filter.bind("<<ComboboxSelected>>", lambda e: self.populate_tasks())
+        self.phase_filter.bind("<<ComboboxSelected>>", lambda e: self.search.refresh())
 
         # Objective Filter
         ttk.Label(search_frame, text="Objective Filter:").pack(side=tk.LEFT, padx=5)
         self.objective_filter_var = tk.StringVar(value="All")
         self.objective_filter = ttk.Combobox(search_frame, textvariable=self.objective_filter_var)
         self.objective_filter.pack(side=tk.LEFT)
-        self.objective_filter.bind("<<ComboboxSelected>>", lambda e: self.populate_tasks())
+        self.objective_filter.bind("<<ComboboxSelected>>", lambda e: self.search.refresh())
 
     # ----------------------------------------------------------
     #                   TREEVIEW
     # ----------------------------------------------------------
     def _create_treeview(self):
         columns = ("Title", "Date", "Status", "Category", "Priority", "Est Time", "Phase", "Objective")
-        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=20)
+        # Only the rows in view exist as Treeview items; see VirtualTaskList
+        self.task_list = VirtualTaskList(self, columns, self._task_values)
+        self.tree = self.task_list.tree
         for col in columns:
-            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by(c, False))
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
             self.tree.column(col, anchor=tk.CENTER, width=150)
-        self.tree.pack(fill=tk.BOTH, expand=True)
+        # Shift-click on a heading adds it as a further sort key
+        self.tree.bind('<Shift-Button-1>', self._on_heading_shift_click, add='+')
+        self.task_list.pack(fill=tk.BOTH, expand=True)
         self.tree.bind('<Double-1>', self.on_task_select)
 
     # ----------------------------------------------------------
@@ -591,140 +3287,228 @@ class Arcanaeum(tk.Tk):
     #               POPULATING & SEARCH
     # ----------------------------------------------------------
     def populate_tasks(self):
-        self.tree.delete(*self.tree.get_children())
+        """
+        Full refresh after data changes: filter choices, task list and progress.
+        Date-based statuses are kept current by the DB writes and the midnight timer.
+        """
+        self._refresh_filter_choices()
+        self.search.refresh()
+        self.update_progress()
 
-        phases = self.db.get_phases()
-        objectives = self.db.get_objectives()
-        tasks = self.db.get_tasks()
+    def _refresh_filter_choices(self, phases=None, objectives=None):
+        if phases is None:
+            phases = self.db.get_phases()
+        if objectives is None:
+            objectives = self.db.get_objectives()
 
         # Build phase map
-        phase_map = {p['id']: f"{p['phase_number']}: {p['phase_title']}" for p in phases}
+        self.phase_labels = {p['id']: f"{p['phase_number']}: {p['phase_title']}" for p in phases}
+        self.phase_numbers = {p['id']: p['phase_number'] for p in phases}
         # Build objective map
-        objective_map = {}
+        self.objective_labels = {}
         for o in objectives:
             # e.g. "3|Backprop Fundamentals"
-            objective_map[o['id']] = f"{o['id']} - {o['objective_name']}"
+            self.objective_labels[o['id']] = f"{o['id']} - {o['objective_name']}"
 
-        # Rebuild combo values for phase & objective
+        # Rebuild combo values for phase & objective; the label -> id maps let
+        # the selected filter be pushed down to SQL as an id.
+        self.phase_filter_ids = {label: pid for pid, label in self.phase_labels.items()}
         phase_names = ["All"] + [f"{p['phase_number']}: {p['phase_title']}" for p in phases]
         current_phase_filter_val = self.phase_filter_var.get()
         self.phase_filter['values'] = phase_names
         if current_phase_filter_val not in phase_names:
             self.phase_filter_var.set("All")
 
+        self.objective_filter_ids = {label: oid for oid, label in self.objective_labels.items()}
         objective_names = ["All"] + [f"{o['id']} - {o['objective_name']}" for o in objectives]
         current_obj_filter_val = self.objective_filter_var.get()
         self.objective_filter['values'] = objective_names
         if current_obj_filter_val not in objective_names:
             self.objective_filter_var.set("All")
 
-        # Date-based status check
-        today = datetime.date.today()
-        for t in tasks:
-            if t['status'] == 'Pending':
-                try:
-                    dt = datetime.datetime.strptime(t['date'], '%Y-%m-%d').date()
-                    if dt < today:
-                        t['status'] = 'Behind'
-                    elif dt > today:
-                        t['status'] = 'Ahead'
-                    else:
-                        t['status'] = 'Pending'
-                    self.db.update_task(t['id'], t)
-                except:
-                    pass
-
-        # Apply filters
-        query = self.search_var.get().lower()
-        cat_filter = self.category_filter_var.get()
-        pri_filter = self.priority_filter_var.get()
-        phase_filter_value = self.phase_filter_var.get()
-        obj_filter_value = self.objective_filter_var.get()
-
-        filtered = []
-        for t in tasks:
-            # Search filter
-            if query:
-                if query not in t['title'].lower() and query not in t['description'].lower():
-                    continue
-            # Category filter
-            if cat_filter != "All" and t['category'] != cat_filter:
-                continue
-            # Priority filter
-            if pri_filter != "All" and t['priority'] != pri_filter:
-                continue
-
-            # Phase filter
-            ph_label = phase_map.get(t['phase_id'], "No Phase")
-            if phase_filter_value != "All" and phase_filter_value != ph_label:
-                continue
+    def show_tasks(self, tasks, keep_position=False):
+        """
+        Shows an in-memory list of (already filtered) tasks, in the current sort order.
+        """
+        if self.sort_order:
+            tasks = self._sorted_rows(tasks)
+        self.task_list.set_rows(tasks, keep_position=keep_position)
 
-            # Objective filter
-            obj_label = "No Objective"
-            if t['objective_id']:
-                obj_label = objective_map.get(t['objective_id'], "No Objective")
-            if obj_filter_value != "All" and obj_filter_value != obj_label:
-                continue
+    def show_query(self, filters, keep_position=False, seed=None):
+        """
+        Shows the tasks matching `filters`, paged from the DB as the list scrolls.
+        `seed` = {'total': n, 'first_page': (rows, cursor)} reuses rows that were
+        already read (the start-up snapshot) instead of querying again; it is
+        only valid for the unfiltered list in default order.
+        """
+        order = list(self.sort_order)
+        # offset -> keyset cursor of the row before it; scrolling on from a
+        # loaded page then seeks instead of counting through OFFSET rows
+        cursors = {}
+        seeded = {}
+        if seed is not None and not filters and not order:
+            total = seed['total']
+            rows, cursor = seed['first_page']
+            seeded[0] = rows
+            if cursor is not None:
+                cursors[len(rows)] = cursor
+        else:
+            total = self.db.count_tasks(filters)
+
+        def fetch(offset, limit):
+            if offset in seeded:
+                return seeded.pop(offset)
+            after = cursors.get(offset)
+            rows, cursor = self.db.get_tasks_page(after, limit, filters, order, compact=True,
+                                                  offset=0 if after is not None else offset)
+            if cursor is not None:
+                cursors[offset + len(rows)] = cursor
+            return rows
+
+        self.task_list.set_source(total, fetch, keep_position=keep_position)
+
+    def _task_values(self, t):
+        ph_label = self.phase_labels.get(t['phase_id'], "No Phase")
+        obj_label = "No Objective"
+        if t['objective_id']:
+            obj_label = self.objective_labels.get(t['objective_id'], "No Objective")
+        return (
+            t['title'],
+            t['date'],
+            t['status'],
+            t['category'],
+            t['priority'],
+            t['estimated_time'],
+            ph_label,
+            obj_label
+        )
 
-            filtered.append(t)
-
-        self.filtered_tasks = filtered
-
-        # Insert into tree
-        for t in filtered:
-            ph_label = phase_map.get(t['phase_id'], "No Phase")
-            obj_label = "No Objective"
-            if t['objective_id']:
-                obj_label = objective_map.get(t['objective_id'], "No Objective")
-
-            self.tree.insert(
-                '', tk.END, iid=str(t['id']),
-                values=(
-                    t['title'],
-                    t['date'],
-                    t['status'],
-                    t['category'],
-                    t['priority'],
-                    t['estimated_time'],
-                    ph_label,
-                    obj_label
-                )
-            )
+    def _schedule_midnight_refresh(self):
+        now = datetime.datetime.now()
+        next_midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1),
+                                                  datetime.time())
+        # A second past midnight so date.today() has definitely rolled over
+        delay_ms = int((next_midnight - now).total_seconds() * 1000) + 1000
+        self.after(delay_ms, self._on_midnight)
 
-        self.update_progress()
+    def _on_midnight(self):
+        if self.db.refresh_statuses():
+            self.populate_tasks()
+        self._schedule_midnight_refresh()
 
-    def on_search(self, event):
-        self.populate_tasks()
+    def current_filters(self):
+        """
+        Translates the search box and filter comboboxes into a query_tasks() filter dict.
+        """
+        filters = {}
+        query = self.search_var.get()
+        if query:
+            filters['search'] = query
+        if self.category_filter_var.get() != "All":
+            filters['category'] = self.category_filter_var.get()
+        if self.priority_filter_var.get() != "All":
+            filters['priority'] = self.priority_filter_var.get()
+        phase_label = self.phase_filter_var.get()
+        if phase_label != "All" and phase_label in self.phase_filter_ids:
+            filters['phase_id'] = self.phase_filter_ids[phase_label]
+        objective_label = self.objective_filter_var.get()
+        if objective_label != "All" and objective_label in self.objective_filter_ids:
+            filters['objective_id'] = self.objective_filter_ids[objective_label]
+        return filters
 
     def clear_search(self):
         self.search_var.set('')
-        self.populate_tasks()
+        self.search.run_now()
 
     # ----------------------------------------------------------
     #               SORTING & PROGRESS
     # ----------------------------------------------------------
-    def sort_by(self, col, descending):
-        data = [(self.tree.set(child, col), child) for child in self.tree.get_children('')]
-
-        def try_float(x):
-            try:
-                return float(x)
-            except:
-                return x
-
-        data.sort(key=lambda x: try_float(x[0]), reverse=descending)
-        for idx, item in enumerate(data):
-            self.tree.move(item[1], '', idx)
-
-        self.tree.heading(col, command=lambda: self.sort_by(col, not descending))
+    # Tree column -> task field used for sorting
+    SORT_FIELDS = {
+        "Title": 'title',
+        "Date": 'date',
+        "Status": 'status',
+        "Category": 'category',
+        "Priority": 'priority',
+        "Est Time": 'estimated_time',
+        "Phase": 'phase_id',
+        "Objective": 'objective_id',
+    }
+
+    def sort_by(self, col, extend=False):
+        """
+        Sorts on `col`. A plain click makes it the only key, or flips its
+        direction if it already is; with extend=True (shift-click) it is added
+        as the next key, or flipped in place if already part of the sort.
+        """
+        # Sorting happens in the data source (ORDER BY, or the in-memory result
+        # list), so it covers every matching row, not just the ones in view.
+        field = self.SORT_FIELDS[col]
+        current = dict(self.sort_order)
+        if extend:
+            if field in current:
+                self.sort_order = [(f, not d if f == field else d) for f, d in self.sort_order]
+            else:
+                self.sort_order = self.sort_order + [(field, False)]
+        elif len(self.sort_order) == 1 and field in current:
+            self.sort_order = [(field, not current[field])]
+        else:
+            self.sort_order = [(field, False)]
+        self._update_sort_headings()
+        self.search.refresh()
 
-    def update_progress(self):
-        tasks = self.db.get_tasks()
-        total_tasks = len(tasks)
+    def _on_heading_shift_click(self, event):
+        if self.tree.identify_region(event.x, event.y) != 'heading':
+            return
+        column_id = self.tree.identify_column(event.x)
+        columns = self.tree['columns']
+        index = int(column_id.lstrip('#')) - 1
+        if 0 <= index < len(columns):
+            self.sort_by(columns[index], extend=True)
+
+    def _update_sort_headings(self):
+        keys = {field: (i, descending) for i, (field, descending) in enumerate(self.sort_order)}
+        for col, field in self.SORT_FIELDS.items():
+            text = col
+            if field in keys:
+                i, descending = keys[field]
+                text += ' \u25bc' if descending else ' \u25b2'
+                if len(self.sort_order) > 1:
+                    text += str(i + 1)
+            self.tree.heading(col, text=text)
+
+    def _sort_key(self, field):
+        # Python twin of ArcanaeumDB.TASK_SORT_FIELDS, for in-memory result lists
+        if field == 'priority':
+            return lambda t: PRIORITY_ORDER.get(t['priority'], len(PRIORITY_ORDER))
+        if field == 'status':
+            return lambda t: STATUS_ORDER.get(t['status'], len(STATUS_ORDER))
+        if field == 'estimated_time':
+            return lambda t: _or_last(parse_duration(t['estimated_time']))
+        if field == 'phase_id':
+            numbers = self.phase_numbers
+            return lambda t: _or_last(numbers.get(t['phase_id']))
+        if field == 'objective_id':
+            return lambda t: _or_last(t['objective_id'])
+        if field == 'date':
+            return lambda t: t['date'] or ''
+        return lambda t: (t[field] or '').lower()
+
+    def _sorted_rows(self, rows):
+        rows = list(rows)
+        # Stable sorts applied last key first give a multi-key sort
+        for field, descending in reversed(self.sort_order):
+            rows.sort(key=self._sort_key(field), reverse=descending)
+        return rows
+
+    def update_progress(self, status_counts=None):
+        if status_counts is None:
+            completed, total_tasks = self.db.get_progress()
+        else:
+            completed, total_tasks = status_counts.get('Completed', 0), sum(status_counts.values())
         if total_tasks == 0:
             progress = 0
         else:
-            completed = len([t for t in tasks if t['status'] == 'Completed'])
             progress = (completed / total_tasks) * 100
         self.progress_var.set(progress)
 
@@ -735,7 +3519,7 @@ class Arcanaeum(tk.Tk):
         TaskDialog(self, self.db, self.populate_tasks)
 
     def edit_task_dialog(self):
-        selected_item = self.tree.selection()
+        selected_item = self.task_list.selection()
         if not selected_item:
             messagebox.showwarning("Selection Error", "Select a task to edit.")
             return
@@ -745,21 +3529,22 @@ class Arcanaeum(tk.Tk):
             TaskDialog(self, self.db, self.populate_tasks, task=task)
 
     def delete_task(self):
-        selected_item = self.tree.selection()
+        selected_item = self.task_list.selection()
         if not selected_item:
             messagebox.showwarning("Selection Error", "Select a task to delete.")
             return
         task_id = int(selected_item[0])
         self.db.delete_task(task_id)
+        self.task_list.deselect(selected_item[0])
         self.populate_tasks()
 
     def mark_completed(self):
-        selected_item = self.tree.selection()
+        selected_item = self.task_list.selection()
         if not selected_item:
             messagebox.showwarning("Selection Error", "Select a task to mark completed.")
             return
         task_id = int(selected_item[0])
-        task = self.db.get_task_by_id(task_id)
+        task = self.db.get_task_by_id(task_id, include_resources=False)
         if task:
             task['status'] = 'Completed'
             task['completion_timestamp'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -816,7 +3601,7 @@ class Arcanaeum(tk.Tk):
         self.populate_tasks()
 
     def on_task_select(self, event):
-        sel = self.tree.selection()
+        sel = self.task_list.selection()
         if sel:
             task_id = int(sel[0])
             task = self.db.get_task_by_id(task_id)
@@ -834,122 +3619,155 @@ class Arcanaeum(tk.Tk):
             "phases": [ { ...phase fields... }, ... ],
             "objectives": [ { ...objective fields... }, ... ]
           }
-        We do not handle partial or missing arrays gracefully here—just a quick approach.
+        Any of the arrays may be missing. The file (optionally gzip-compressed) is
+        streamed on the worker thread in bounded batches; cancelling rolls back.
         """
-        filename = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
+        filename = filedialog.askopenfilename(filetypes=[("JSON files", "*.json *.json.gz")])
         if not filename:
             return
-        with open(filename, 'r') as f:
-            data = json.load(f)
-
         confirm = messagebox.askyesno("Confirm Import", "This will replace all current tasks, phases, objectives. Continue?")
         if confirm:
-            # Wipe tasks, phases, objectives
-            conn = sqlite3.connect(self.db.db_file)
-            c = conn.cursor()
-            c.execute('DELETE FROM tasks')
-            c.execute('DELETE FROM phases')
-            c.execute('DELETE FROM objectives')
-            conn.commit()
-            conn.close()
+            self.worker.run_with_progress(
+                self, "Importing JSON", self._import_json_file, filename,
+                on_done=lambda counts: self._import_finished(
+                    f"Imported from {filename}" + self._unresolved_note(counts)))
+
+    def _import_json_file(self, filename, progress=None, cancel=None):
+        # Worker thread: DB and file access only, no Tk. Progress is bytes read.
+        size = os.path.getsize(filename)
+        with open_schedule_file(filename) as (f, raw):
+            records = iter_json_arrays(f, on_chunk=lambda: progress(raw.tell(), size))
+            return self.db.replace_schedule_stream(records, cancel=cancel)
+
+    @staticmethod
+    def _unresolved_note(counts):
+        unresolved = sum(result['unresolved'] for result in counts.values())
+        if not unresolved:
+            return ""
+        return f"\n\n{unresolved} references to phases/objectives missing from the file were cleared."
+
+    def import_json_merge(self):
+        """
+        Merges a JSON schedule (same format as import_json) into the current one:
+        shows what would be inserted, changed and removed, then applies it.
+        """
+        filename = filedialog.askopenfilename(filetypes=[("JSON files", "*.json *.json.gz")])
+        if not filename:
+            return
 
-            # Re-add phases
-            for p in data.get('phases', []):
-                self.db.add_phase(p)
-            # Re-add objectives
-            for o in data.get('objectives', []):
-                self.db.add_objective(o)
-            # Re-add tasks
-            for t in data.get('tasks', []):
-                self.db.add_task(t)
+        self._merge_with_preview("JSON", self._merge_json_file, filename)
 
-            self.populate_tasks()
-            messagebox.showinfo("Import Successful", f"Imported from {filename}")
+    def _merge_with_preview(self, kind, merge_file, filename):
+        # Dry run on the worker, report, then the real merge once confirmed
+        def confirm(summary):
+            report = format_merge_summary(summary)
+            if messagebox.askyesno("Confirm Merge", f"{report}\n\nApply these changes?"):
+                self.worker.run_with_progress(
+                    self, f"Merging {kind}", merge_file, filename,
+                    on_done=lambda _: self._import_finished(f"Merged from {filename}"))
 
-    def export_json(self):
-        tasks = self.db.get_tasks()
-        phases = self.db.get_phases()
-        objectives = self.db.get_objectives()
-        filename = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
+        self.worker.run_with_progress(
+            self, f"Comparing {kind}", merge_file, filename, dry_run=True, on_done=confirm)
+
+    def _merge_json_file(self, filename, progress=None, cancel=None, dry_run=False):
+        size = os.path.getsize(filename)
+        with open_schedule_file(filename) as (f, raw):
+            records = iter_json_arrays(f, on_chunk=lambda: progress(raw.tell(), size))
+            return self.db.merge_schedule_stream(records, dry_run=dry_run, cancel=cancel)
+
+    def _import_finished(self, message):
+        self.populate_tasks()
+        messagebox.showinfo("Import Successful", message)
+
+    def export_json(self, compact=False):
+        """
+        Writes phases, objectives and tasks in the import_json() shape, streamed
+        from the DB. compact=True drops the indentation; a '.gz' filename is
+        gzip-compressed.
+        """
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("Compressed JSON files", "*.json.gz")])
         if not filename:
             return
-        with open(filename, 'w') as f:
-            json.dump({
-                "tasks": tasks,
-                "phases": phases,
-                "objectives": objectives
-            }, f, indent=4)
-        messagebox.showinfo("Export Successful", f"Exported to {filename}")
+        self.worker.run_with_progress(
+            self, "Exporting JSON", self._export_json_file, filename, compact=compact,
+            on_done=lambda _: messagebox.showinfo("Export Successful", f"Exported to {filename}"))
+
+    def _export_json_file(self, filename, progress=None, cancel=None, compact=False):
+        records = self.db.iter_export(progress=progress, cancel=cancel)
+        with open_schedule_file(filename, 'w') as (f, _raw):
+            write_json_arrays(f, ArcanaeumDB.EXPORT_SECTIONS, records, indent=None if compact else 4)
 
     def export_csv(self):
-        tasks = self.db.get_tasks()
-        if not tasks:
+        if not self.db.count_tasks():
             messagebox.showinfo("No Tasks", "No tasks to export.")
             return
-        filename = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("Compressed CSV files", "*.csv.gz")])
         if not filename:
             return
+        self.worker.run_with_progress(
+            self, "Exporting CSV", self._export_csv_file, filename,
+            on_done=lambda _: messagebox.showinfo("Export Successful", f"Tasks exported to {filename}"))
+
+    def _export_csv_file(self, filename, progress=None, cancel=None):
         import csv
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=tasks[0].keys())
-            writer.writeheader()
-            for t in tasks:
-                writer.writerow(t)
-        messagebox.showinfo("Export Successful", f"Tasks exported to {filename}")
+        with open_schedule_file(filename, 'w', newline='') as (f, _raw):
+            writer = csv.writer(f)
+            writer.writerow(ArcanaeumDB.EXPORT_TASK_FIELDS)
+            for section, t in self.db.iter_export(progress=progress, cancel=cancel):
+                if section != 'tasks':
+                    break   # tasks come first
+                writer.writerow(t.values())
 
     def import_ics(self):
-        if not Calendar:
-            messagebox.showwarning("Not Available", "icalendar library not installed.")
-            return
-        filename = filedialog.askopenfilename(filetypes=[("ICS files", "*.ics")])
+        """
+        Merges the events of an iCalendar file into the tasks (see
+        ics_event_tasks), after showing what would change. Re-importing updates
+        the same tasks in place; tasks from an earlier ICS import that are no
+        longer in the file are removed, and all other tasks are left alone.
+        """
+        filename = filedialog.askopenfilename(filetypes=[("ICS files", "*.ics *.ics.gz")])
         if not filename:
             return
-        with open(filename, 'rb') as f:
-            cal_data = f.read()
-        cal = Calendar.from_ical(cal_data)
-
-        confirm = messagebox.askyesno("Confirm Import", "This will replace all current tasks. Continue?")
-        if confirm:
-            conn = sqlite3.connect(self.db.db_file)
-            c = conn.cursor()
-            c.execute('DELETE FROM tasks')
-            conn.commit()
-            conn.close()
-
-            for component in cal.walk('vevent'):
-                title = str(component.get('summary', 'No Title'))
-                description = str(component.get('description', ''))
-                dtstart = component.get('dtstart')
-                date_str = (dtstart.dt.strftime('%Y-%m-%d') if dtstart else
-                            datetime.datetime.now().strftime('%Y-%m-%d'))
-                task = {
-                    'phase_id': None,
-                    'objective_id': None,
-                    'title': title,
-                    'description': description,
-                    'date': date_str,
-                    'status': 'Pending',
-                    'resources': [],
-                    'recurring': False,
-                    'priority': 'Medium',
-                    'category': 'General',
-                    'estimated_time': '',
-                    'completion_timestamp': ''
-                }
-                self.db.add_task(task)
-
-        self.populate_tasks()
-        messagebox.showinfo("Import Successful", "Imported from ICS file.")
+        self._merge_with_preview("ICS", self._merge_ics_file, filename)
+
+    def _merge_ics_file(self, filename, progress=None, cancel=None, dry_run=False):
+        # Worker thread: the calendar is streamed event by event into the merge,
+        # after a first pass that collects the dates moved by overrides
+        size = os.path.getsize(filename)
+        with open_schedule_file(filename) as (f, raw):
+            overridden = ics_overrides(iter_ics_events(f, on_chunk=lambda: progress(raw.tell(), 2 * size)))
+        cancel.check()
+        with open_schedule_file(filename) as (f, raw):
+            events = iter_ics_events(f, on_chunk=lambda: progress(size + raw.tell(), 2 * size))
+            records = (('tasks', task) for task in ics_event_tasks(events, overridden=overridden))
+            return self.db.merge_schedule_stream(records, dry_run=dry_run, cancel=cancel,
+                                                 key_prefix=ArcanaeumDB.ICS_KEY_PREFIX)
 
     def export_ics(self):
-        if not Calendar:
+        if not HAS_ICALENDAR:
             messagebox.showwarning("Not Available", "icalendar library not installed.")
             return
-        tasks = self.db.get_tasks()
+        filename = filedialog.asksaveasfilename(defaultextension=".ics", filetypes=[("ICS files", "*.ics")])
+        if not filename:
+            return
+        self.worker.run_with_progress(
+            self, "Exporting ICS", self._export_ics_file, filename,
+            on_done=lambda _: messagebox.showinfo("Export Successful", f"Exported to {filename}"))
+
+    def _export_ics_file(self, filename, progress=None, cancel=None):
+        from icalendar import Calendar, Event
+        tasks = self.db.get_tasks(compact=True)
         cal = Calendar()
         cal.add('prodid', '-//Arcanaeum//')
         cal.add('version', '2.0')
-        for t in tasks:
+        for i, t in enumerate(tasks):
+            if i % ArcanaeumDB.PROGRESS_EVERY == 0:
+                cancel.check()
+                progress(i, len(tasks))
             event = Event()
             event.add('summary', t['title'])
             event.add('description', t['description'])
@@ -959,27 +3777,27 @@ class Arcanaeum(tk.Tk):
             except:
                 pass
             cal.add_component(event)
-        filename = filedialog.asksaveasfilename(defaultextension=".ics", filetypes=[("ICS files", "*.ics")])
-        if not filename:
-            return
+        cancel.check()
         with open(filename, 'wb') as f:
             f.write(cal.to_ical())
-        messagebox.showinfo("Export Successful", f"Exported to {filename}")
 
     # ----------------------------------------------------------
     #               VIEWS: CALENDAR, KANBAN, STATS
     # ----------------------------------------------------------
     def show_calendar(self):
-        CalendarView(self, self.db.get_tasks())
+        CalendarView(self, self.db, self.worker)
 
     def show_kanban_board(self):
-        KanbanBoard(self, self.db.get_tasks())
+        KanbanBoard(self, self.db)
 
     def show_statistics(self):
-        if plt is None:
+        if not HAS_MATPLOTLIB:
             messagebox.showwarning("Not Available", "matplotlib not installed.")
             return
-        StatsView(self, self.db.get_tasks())
+        # Aggregated on the worker (or straight from the cache); the window
+        # opens once the numbers are in
+        self.worker.submit(self.db.get_statistics,
+                           on_done=lambda stats: StatsView(self, stats))
 
     # ----------------------------------------------------------
     #               DARK MODE
@@ -1036,12 +3854,14 @@ class Arcanaeum(tk.Tk):
     # ----------------------------------------------------------
     #               NOTIFICATIONS
     # ----------------------------------------------------------
-    def notify_tasks_due_today(self):
-        if not notification:
+    def notify_tasks_due_today(self, due_today=None):
+        if not HAS_PLYER:
             return
-        tasks = self.db.get_tasks()
-        today = datetime.datetime.now().strftime('%Y-%m-%d')
-        due_today = [t for t in tasks if t['date'] == today and t['status'] in ['Pending', 'Behind', 'Ahead']]
+        from plyer import notification
+        if due_today is None:
+            today = datetime.date.today()
+            tasks = self.db.get_tasks_by_day(today, today).get(today.isoformat(), [])
+            due_today = [t for t in tasks if t['status'] in ['Pending', 'Behind', 'Ahead']]
         for t in due_today:
             notification.notify(
                 title="Arcanaeum - Task Due Today",
@@ -1133,9 +3953,9 @@ class TaskDialog(tk.Toplevel):
         self.estimate_entry = ttk.Entry(self, width=50)
         self.estimate_entry.pack()
 
-        ttk.Label(self, text="Resources (comma-separated URLs or file paths):").pack(pady=5)
-        self.resources_entry = ttk.Entry(self, width=50)
-        self.resources_entry.pack()
+        ttk.Label(self, text="Resources (one URL or file path per line):").pack(pady=5)
+        self.resources_text = tk.Text(self, width=50, height=4)
+        self.resources_text.pack()
 
         ttk.Label(self, text="Recurring:").pack(pady=5)
         self.recurring_var = tk.BooleanVar()
@@ -1169,7 +3989,7 @@ class TaskDialog(tk.Toplevel):
         self.priority_var.set(self.task.get('priority', 'Medium'))
         self.category_var.set(self.task.get('category', 'General'))
         self.estimate_entry.insert(0, self.task.get('estimated_time', ''))
-        self.resources_entry.insert(0, ','.join(self.task['resources']))
+        self.resources_text.insert(tk.END, '\n'.join(self.task['resources']))
         self.recurring_var.set(self.task.get('recurring', False))
 
     def save_task(self):
@@ -1180,7 +4000,7 @@ class TaskDialog(tk.Toplevel):
         priority = self.priority_var.get()
         category = self.category_var.get()
         estimated_time = self.estimate_entry.get().strip()
-        resources = [r.strip() for r in self.resources_entry.get().split(',') if r.strip()]
+        resources = [r.strip() for r in self.resources_text.get("1.0", tk.END).splitlines() if r.strip()]
         recurring = self.recurring_var.get()
 
         if not title:
@@ -1296,13 +4116,17 @@ class PhaseManagerDialog(tk.Toplevel):
         self.title("Manage Phases")
         self.geometry("600x400")
 
-        self.tree = ttk.Treeview(self, columns=("Number", "Title", "Description"), show='headings')
+        list_frame = ttk.Frame(self)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(list_frame, columns=("Number", "Title", "Description"), show='headings')
         self.tree.heading("Number", text="Phase #")
         self.tree.heading("Title", text="Phase Title")
         self.tree.heading("Description", text="Description")
         self.tree.column("Number", width=60, anchor=tk.CENTER)
         self.tree.column("Title", width=150, anchor=tk.CENTER)
         self.tree.column("Description", width=300, anchor=tk.CENTER)
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.tree.pack(fill=tk.BOTH, expand=True)
         self.tree.bind("<Double-1>", self.edit_phase_dialog)
 
@@ -1312,17 +4136,13 @@ class PhaseManagerDialog(tk.Toplevel):
         ttk.Button(btn_frame, text="Delete Phase", command=self.delete_phase).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Close", command=self.close_dialog).pack(side=tk.RIGHT, padx=5)
 
-        self.populate_phases()
+        self.loader = PagedTreeLoader(
+            self.tree, scrollbar,
+            lambda after, limit: self.db.get_phases_page(after, limit, compact=True),
+            lambda p: (p['phase_number'], p['phase_title'], p['phase_description']))
 
     def populate_phases(self):
-        self.tree.delete(*self.tree.get_children())
-        phases = self.db.get_phases()
-        for p in phases:
-            self.tree.insert(
-                '', tk.END,
-                iid=str(p['id']),
-                values=(p['phase_number'], p['phase_title'], p['phase_description'])
-            )
+        self.loader.reload()
 
     def add_phase_dialog(self):
         PhaseDialog(self, self.db, self.populate_phases)
@@ -1332,12 +4152,7 @@ class PhaseManagerDialog(tk.Toplevel):
         if not sel:
             return
         phase_id = int(sel[0])
-        phases = self.db.get_phases()
-        phase_obj = None
-        for p in phases:
-            if p['id'] == phase_id:
-                phase_obj = p
-                break
+        phase_obj = self.db.get_phase_by_id(phase_id)
         if phase_obj:
             PhaseDialog(self, self.db, self.populate_phases, phase=phase_obj)
 
@@ -1437,7 +4252,9 @@ class ObjectiveManagerDialog(tk.Toplevel):
         self.title("Manage Objectives")
         self.geometry("800x400")
 
-        self.tree = ttk.Treeview(self, columns=("PhaseID", "ObjectiveName", "Description", "Criteria"), show='headings')
+        list_frame = ttk.Frame(self)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(list_frame, columns=("PhaseID", "ObjectiveName", "Description", "Criteria"), show='headings')
         self.tree.heading("PhaseID", text="Phase ID")
         self.tree.heading("ObjectiveName", text="Objective Name")
         self.tree.heading("Description", text="Description")
@@ -1446,6 +4263,8 @@ class ObjectiveManagerDialog(tk.Toplevel):
         self.tree.column("ObjectiveName", width=150, anchor=tk.CENTER)
         self.tree.column("Description", width=200, anchor=tk.W)
         self.tree.column("Criteria", width=200, anchor=tk.W)
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.tree.pack(fill=tk.BOTH, expand=True)
         self.tree.bind("<Double-1>", self.edit_objective_dialog)
 
@@ -1455,17 +4274,13 @@ class ObjectiveManagerDialog(tk.Toplevel):
         ttk.Button(btn_frame, text="Delete Objective", command=self.delete_objective).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Close", command=self.close_dialog).pack(side=tk.RIGHT, padx=5)
 
-        self.populate_objectives()
+        self.loader = PagedTreeLoader(
+            self.tree, scrollbar,
+            lambda after, limit: self.db.get_objectives_page(after, limit, compact=True),
+            lambda o: (o['phase_id'], o['objective_name'], o['objective_description'], o.get('completion_criteria','')))
 
     def populate_objectives(self):
-        self.tree.delete(*self.tree.get_children())
-        objectives = self.db.get_objectives()
-        for o in objectives:
-            self.tree.insert(
-                '', tk.END,
-                iid=str(o['id']),
-                values=(o['phase_id'], o['objective_name'], o['objective_description'], o.get('completion_criteria',''))
-            )
+        self.loader.reload()
 
     def add_objective_dialog(self):
         ObjectiveDialog(self, self.db, self.populate_objectives)
@@ -1475,12 +4290,7 @@ class ObjectiveManagerDialog(tk.Toplevel):
         if not sel:
             return
         obj_id = int(sel[0])
-        objectives = self.db.get_objectives()
-        obj_obj = None
-        for o in objectives:
-            if o['id'] == obj_id:
-                obj_obj = o
-                break
+        obj_obj = self.db.get_objective_by_id(obj_id)
         if obj_obj:
             ObjectiveDialog(self, self.db, self.populate_objectives, objective=obj_obj)
 
@@ -1629,11 +4439,15 @@ class ReflectionViewer(tk.Toplevel):
         self.title("View Reflections")
         self.geometry("600x400")
 
-        self.tree = ttk.Treeview(self, columns=("Timestamp", "Content"), show='headings')
+        list_frame = ttk.Frame(self)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(list_frame, columns=("Timestamp", "Content"), show='headings')
         self.tree.heading("Timestamp", text="Timestamp")
         self.tree.heading("Content", text="Content")
         self.tree.column("Timestamp", width=150, anchor=tk.CENTER)
         self.tree.column("Content", width=400, anchor=tk.W)
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.tree.pack(fill=tk.BOTH, expand=True)
         self.tree.bind("<Double-1>", self.on_reflection_select)
 
@@ -1642,13 +4456,11 @@ class ReflectionViewer(tk.Toplevel):
         ttk.Button(btn_frame, text="Delete Reflection", command=self.delete_reflection).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Close", command=self.destroy).pack(side=tk.RIGHT, padx=5)
 
-        self.populate_reflections()
-
-    def populate_reflections(self):
-        self.tree.delete(*self.tree.get_children())
-        reflections = self.db.get_reflections()
-        for r in reflections:
-            self.tree.insert('', tk.END, iid=str(r['id']), values=(r['timestamp'], r['content']))
+        # Newest first, one page at a time: journals grow for years
+        self.loader = PagedTreeLoader(
+            self.tree, scrollbar,
+            lambda after, limit: self.db.get_reflections_page(after, limit, compact=True),
+            lambda r: (r['timestamp'], r['content']))
 
     def on_reflection_select(self, event):
         pass
@@ -1661,7 +4473,8 @@ class ReflectionViewer(tk.Toplevel):
         confirm = messagebox.askyesno("Confirm", "Are you sure you want to delete this reflection?")
         if confirm:
             self.db.delete_reflection(reflection_id)
-            self.populate_reflections()
+            # Deleting doesn't move the others; keep the loaded pages and position
+            self.tree.delete(sel[0])
 
 
 # =================================================================
@@ -1731,12 +4544,27 @@ class WeeklyReport(tk.Toplevel):
 # =================================================================
 
 class CalendarView(tk.Toplevel):
-    def __init__(self, parent, tasks):
+    """
+    Month or week grid (Monday first) that can be moved back and forth.
+    Each period is one ArcanaeumDB.get_tasks_by_day() range query; the periods
+    either side of the one shown are prefetched on the worker, and cached
+    results are reused until the DB's write_version moves on.
+    """
+
+    DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+    MAX_CACHED_PERIODS = 12
+
+    def __init__(self, parent, db, worker):
         super().__init__(parent)
         self.title("Calendar View")
         self.geometry("800x400")
-        self.tasks = tasks
+        self.db = db
+        self.worker = worker
         self.view_mode = "month"
+        self.anchor = datetime.date.today()
+        # (start, end) -> (write_version, {date: [TaskRow, ...]})
+        self._cache = collections.OrderedDict()
+        self._prefetching = set()
         self.create_widgets()
 
     def create_widgets(self):
@@ -1744,79 +4572,199 @@ class CalendarView(tk.Toplevel):
         top_frame.pack(fill=tk.X)
         ttk.Button(top_frame, text="Month View", command=self.show_month_view).pack(side=tk.LEFT, padx=5)
         ttk.Button(top_frame, text="Week View", command=self.show_week_view).pack(side=tk.LEFT, padx=5)
+        ttk.Button(top_frame, text="Next >", command=lambda: self.move(1)).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(top_frame, text="Today", command=self.go_today).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(top_frame, text="< Prev", command=lambda: self.move(-1)).pack(side=tk.RIGHT, padx=5)
+        self.period_var = tk.StringVar()
+        ttk.Label(top_frame, textvariable=self.period_var).pack(side=tk.LEFT, padx=15)
 
         self.tree = ttk.Treeview(self, show='headings', height=8)
+        self.tree['columns'] = self.DAYS
+        for col in self.DAYS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=100)
         self.tree.pack(fill=tk.BOTH, expand=True)
         self.show_month_view()
 
     def show_week_view(self):
         self.view_mode = "week"
-        for c in self.tree.get_children():
-            self.tree.delete(c)
-        self.tree['columns'] = ('Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday')
-        for col in self.tree['columns']:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=100)
-        today = datetime.date.today()
-        # Start of the week (Monday-based)
-        start_day = today - datetime.timedelta(days=today.weekday())
-        row = []
-        for day in range(7):
-            current_date = start_day + datetime.timedelta(days=day)
-            date_str = current_date.strftime('%Y-%m-%d')
-            tasks_on_date = [t for t in self.tasks if t['date'] == date_str]
-            cell_text = f"{current_date.day}\n" + "\n".join([f"{tt['title']} ({tt['priority']})" for tt in tasks_on_date])
-            row.append(cell_text)
-        self.tree.insert('', tk.END, values=row)
+        self.render()
 
     def show_month_view(self):
         self.view_mode = "month"
-        for c in self.tree.get_children():
-            self.tree.delete(c)
-        self.tree['columns'] = ('Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday')
-        for col in self.tree['columns']:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=100)
+        self.render()
+
+    def go_today(self):
+        self.anchor = datetime.date.today()
+        self.render()
+
+    def move(self, step):
+        """
+        Moves `step` months or weeks (per the view mode) forwards or back.
+        """
+        self.anchor = self._shift(self.view_mode, self.anchor, step)
+        self.render()
+
+    @staticmethod
+    def _shift(mode, anchor, step):
+        if mode == "week":
+            return anchor + datetime.timedelta(weeks=step)
+        month = anchor.year * 12 + anchor.month - 1 + step
+        return datetime.date(month // 12, month % 12 + 1, 1)
+
+    @staticmethod
+    def _period(mode, anchor):
+        """
+        (first, last) day shown for the period containing `anchor`: a Monday-
+        to-Sunday week, or the whole weeks covering the month (up to six).
+        """
+        if mode == "week":
+            first = anchor - datetime.timedelta(days=anchor.weekday())
+            return first, first + datetime.timedelta(days=6)
+        month_start = anchor.replace(day=1)
+        next_month = CalendarView._shift("month", month_start, 1)
+        first = month_start - datetime.timedelta(days=month_start.weekday())
+        month_end = next_month - datetime.timedelta(days=1)
+        last = month_end + datetime.timedelta(days=6 - month_end.weekday())
+        return first, last
+
+    def render(self):
+        first, last = self._period(self.view_mode, self.anchor)
+        if self.view_mode == "week":
+            self.period_var.set(f"Week of {first:%d %B %Y}")
+        else:
+            self.period_var.set(f"{self.anchor:%B %Y}")
 
-        today = datetime.date.today()
-        first_day = today.replace(day=1)
-        start_day = first_day - datetime.timedelta(days=first_day.weekday())
+        by_day = self._cached(first, last)
+        if by_day is None:
+            by_day = self.db.get_tasks_by_day(first, last)
+            self._store(first, last, self.db.write_version, by_day)
 
-        for week in range(5):
+        self.tree.delete(*self.tree.get_children())
+        day = first
+        while day <= last:
             row = []
-            for day in range(7):
-                current_date = start_day + datetime.timedelta(days=week*7 + day)
-                date_str = current_date.strftime('%Y-%m-%d')
-                tasks_on_date = [t for t in self.tasks if t['date'] == date_str]
-                cell_text = f"{current_date.day}\n" + "\n".join(
+            for _ in range(7):
+                tasks_on_date = by_day.get(day.isoformat(), ())
+                row.append(f"{day.day}\n" + "\n".join(
                     [f"{tt['title']} ({tt['priority']})" for tt in tasks_on_date]
-                )
-                row.append(cell_text)
+                ))
+                day += datetime.timedelta(days=1)
             self.tree.insert('', tk.END, values=row)
 
+        self._prefetch()
+
+    def _cached(self, first, last):
+        entry = self._cache.get((first, last))
+        if entry is None or entry[0] != self.db.write_version:
+            return None
+        self._cache.move_to_end((first, last))
+        return entry[1]
+
+    def _store(self, first, last, version, by_day):
+        self._cache[(first, last)] = (version, by_day)
+        self._cache.move_to_end((first, last))
+        while len(self._cache) > self.MAX_CACHED_PERIODS:
+            self._cache.popitem(last=False)
+
+    def _prefetch(self):
+        # The neighbouring periods load on the worker while this one is shown
+        for step in (-1, 1):
+            first, last = self._period(self.view_mode, self._shift(self.view_mode, self.anchor, step))
+            if (first, last) in self._prefetching or self._cached(first, last) is not None:
+                continue
+            self._prefetching.add((first, last))
+            # Read the version before querying: a write racing the query
+            # leaves the entry stale rather than wrongly current
+            version = self.db.write_version
+            self.worker.submit(self.db.get_tasks_by_day, first, last,
+                               on_done=lambda by_day, key=(first, last), v=version:
+                                   self._prefetched(key, v, by_day),
+                               on_error=lambda exc, key=(first, last): self._prefetching.discard(key))
+
+    def _prefetched(self, key, version, by_day):
+        self._prefetching.discard(key)
+        if self.winfo_exists():
+            self._store(*key, version, by_day)
+
 
 # =================================================================
 #                       KANBAN BOARD
 # =================================================================
 
 class KanbanBoard(tk.Toplevel):
-    def __init__(self, parent, tasks):
+    """
+    One column per status. Headers show the count from the status counters
+    and each column loads its cards a page at a time as it scrolls, so the
+    board opens at the same cost however much history there is. Completed
+    shows the last RECENT_DAYS of completions unless "Show all" is ticked.
+    """
+
+    STATUSES = ["Pending", "Ahead", "Behind", "Completed"]
+    RECENT_DAYS = 30
+    PAGE_SIZE = 50
+
+    def __init__(self, parent, db):
         super().__init__(parent)
         self.title("Kanban Board")
         self.geometry("1000x300")
-        self.tasks = tasks
+        self.db = db
+        self.counts = db.get_status_counts()
+        self.frames = {}
+        self.loaders = {}
 
-        statuses = ["Pending", "Ahead", "Behind", "Completed"]
         main_frame = ttk.Frame(self)
         main_frame.pack(fill=tk.BOTH, expand=True)
 
-        for st in statuses:
-            col_frame = ttk.Labelframe(main_frame, text=st)
+        for st in self.STATUSES:
+            col_frame = ttk.Labelframe(main_frame, text=f"{st} ({self.counts.get(st, 0)})")
             col_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-            tasks_in_status = [t for t in tasks if t['status'] == st]
-            for t in tasks_in_status:
-                lbl = ttk.Label(col_frame, text=f"{t['title']} ({t['date']}) [{t['priority']}]")
-                lbl.pack(anchor=tk.W, padx=5, pady=2)
+            self.frames[st] = col_frame
+            if st == "Completed":
+                self.show_all_var = tk.BooleanVar(value=False)
+                ttk.Checkbutton(col_frame, text="Show all", variable=self.show_all_var,
+                                command=self.reload_completed).pack(anchor=tk.W, padx=5)
+            cards = ttk.Treeview(col_frame, columns=("Card",), show='')
+            scrollbar = ttk.Scrollbar(col_frame, orient=tk.VERTICAL)
+            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            cards.pack(fill=tk.BOTH, expand=True)
+            self.loaders[st] = PagedTreeLoader(
+                cards, scrollbar, self._fetcher(st),
+                lambda t: (f"{t['title']} ({t['date']}) [{t['priority']}]",),
+                page_size=self.PAGE_SIZE)
+        self._update_completed_header()
+
+    def _fetcher(self, status):
+        filters = {'status': status}
+        # Open work by due date; completions newest first
+        order = [('date', False)]
+        if status == "Completed":
+            order = [('completion_timestamp', True)]
+            if not self.show_all_var.get():
+                filters['completed_since'] = self._recent_cutoff()
+
+        def fetch(after, limit):
+            return self.db.get_tasks_page(after, limit, filters, order, compact=True)
+        return fetch
+
+    def _recent_cutoff(self):
+        since = datetime.date.today() - datetime.timedelta(days=self.RECENT_DAYS)
+        return since.strftime('%Y-%m-%d')
+
+    def reload_completed(self):
+        loader = self.loaders["Completed"]
+        loader.fetch = self._fetcher("Completed")
+        loader.reload()
+        self._update_completed_header()
+
+    def _update_completed_header(self):
+        total = self.counts.get("Completed", 0)
+        text = f"Completed ({total})"
+        if not self.show_all_var.get():
+            recent = self.db.count_tasks({'status': "Completed",
+                                          'completed_since': self._recent_cutoff()})
+            text = f"Completed (last {self.RECENT_DAYS} days: {recent} of {total})"
+        self.frames["Completed"].configure(text=text)
 
 
 # =================================================================
@@ -1824,36 +4772,111 @@ class KanbanBoard(tk.Toplevel):
 # =================================================================
 
 class StatsView(tk.Toplevel):
-    def __init__(self, parent, tasks):
+    """
+    Charts over the aggregates from ArcanaeumDB.get_statistics(), one
+    notebook tab per group of related charts.
+    """
+
+    TOP_N = 10      # bars shown for the objective chart
+
+    def __init__(self, parent, stats):
         super().__init__(parent)
         self.title("Statistics")
-        self.geometry("600x400")
-        self.tasks = tasks
+        self.geometry("900x600")
+        self.stats = stats
         self.create_chart()
 
     def create_chart(self):
-        status_counts = {}
-        for t in self.tasks:
-            st = t['status']
-            status_counts[st] = status_counts.get(st, 0) + 1
-
-        if plt:
-            fig, ax = plt.subplots()
-            ax.bar(status_counts.keys(), status_counts.values(), color='skyblue')
-            ax.set_title("Tasks by Status")
-            ax.set_ylabel("Count")
-            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-            canvas = FigureCanvasTkAgg(fig, master=self)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        else:
+        try:
+            self.new_figure = load_figure()
+        except ImportError:
             ttk.Label(self, text="matplotlib is not installed. Cannot display chart.").pack()
+            return
+        notebook = ttk.Notebook(self)
+        notebook.pack(fill=tk.BOTH, expand=True)
+        self._add_tab(notebook, "Overview", self._draw_overview)
+        self._add_tab(notebook, "Breakdown", self._draw_breakdown)
+        self._add_tab(notebook, "Completions", self._draw_completions)
+
+    def _add_tab(self, notebook, title, draw):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        frame = ttk.Frame(notebook)
+        notebook.add(frame, text=title)
+        fig = draw()
+        fig.tight_layout()
+        canvas = FigureCanvasTkAgg(fig, master=frame)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def _draw_overview(self):
+        fig = self.new_figure()
+        status_ax, overdue_ax = fig.subplots(1, 2)
+        by_status = self.stats['by_status']
+        status_ax.bar(list(by_status), list(by_status.values()), color='skyblue')
+        status_ax.set_title("Tasks by Status")
+        status_ax.set_ylabel("Count")
+        overdue = self.stats['overdue']
+        overdue_ax.bar([label for label, _ in overdue], [n for _, n in overdue], color='salmon')
+        overdue_ax.set_title("Open Tasks Overdue By")
+        return fig
+
+    def _draw_breakdown(self):
+        fig = self.new_figure()
+        axes = fig.subplots(1, 3)
+        for ax, key, title in zip(axes, ('by_category', 'by_phase', 'by_objective'),
+                                  ("By Category", "By Phase", f"Top {self.TOP_N} Objectives")):
+            rows = self.stats[key]
+            if key == 'by_objective':
+                rows = rows[:self.TOP_N]
+            labels = [label for label, _, _ in rows]
+            ax.barh(labels, [total for _, total, _ in rows], color='lightgray', label="Total")
+            ax.barh(labels, [done for _, _, done in rows], color='seagreen', label="Completed")
+            ax.invert_yaxis()
+            ax.set_title(title)
+        axes[0].legend()
+        return fig
+
+    def _draw_completions(self):
+        fig = self.new_figure()
+        day_ax, week_ax = fig.subplots(2, 1)
+        per_day = self.stats['per_day']
+        day_ax.bar([day[5:] for day, _ in per_day], [n for _, n in per_day], color='seagreen')
+        day_ax.set_title("Completions per Day")
+        day_ax.tick_params(axis='x', labelrotation=90)
+        per_week = self.stats['per_week']
+        week_ax.plot([week for week, _ in per_week], [n for _, n in per_week], marker='o')
+        week_ax.set_title("Completions per Week")
+        week_ax.tick_params(axis='x', labelrotation=90)
+        return fig
 
 
 # =================================================================
 #                    MAIN LAUNCH
 # =================================================================
 
-if __name__ == "__main__":
-    app = Arcanaeum()
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Arcanaeum scheduler")
+    parser.add_argument('--db', default='arcanaeum.db', help="database file (default: %(default)s)")
+    parser.add_argument('--import-merge', metavar='FILE',
+                        help="merge a JSON schedule (.json or .json.gz) into the database and exit")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="with --import-merge: only report what would change")
+    args = parser.parse_args(argv)
+
+    if args.import_merge:
+        with ArcanaeumDB(args.db) as db, open_schedule_file(args.import_merge) as (f, _raw):
+            summary = db.merge_schedule_stream(iter_json_arrays(f), dry_run=args.dry_run)
+        print(format_merge_summary(summary))
+        if args.dry_run:
+            print("Dry run: nothing was changed.")
+        return
+    if args.dry_run:
+        parser.error("--dry-run needs --import-merge")
+
+    app = Arcanaeum(db_file=args.db)
     app.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmarks for the Arcanaeum data layer.
+
+    python benchmarks.py rows [--sizes 10000 100000 1000000]
+
+    python benchmarks.py startup [--sizes 0 10000 100000]
+
+rows
+    Loads every task from a scratch database with get_tasks() as dicts and as
+    compact TaskRow records, and reports load time (best of --repeat runs) and
+    the memory held by the loaded list (tracemalloc).
+
+    Reference run (best of 3, Python 3.11, one CPU):
+
+             rows  repr       load s       MiB  bytes/row
+            10000  dict        0.078       9.0        939
+            10000  compact     0.062       5.9        619
+           100000  dict        0.824      87.4        916
+           100000  compact     0.714      56.9        596
+          1000000  dict        8.352     874.0        916
+          1000000  compact     9.755     568.9        596
+
+    Compact rows hold about 35% less memory at every size, which is what
+    they are for. The time gain is small (13-20% up to 100k rows) and
+    reverses at 1M: every TaskRow is a tuple the cyclic garbage collector
+    tracks, while dicts of plain values are untracked, so its passes over
+    the growing list cost more than the dicts save. With gc disabled the
+    1M loads take 7.8 s compact against 8.9 s as dicts.
+
+startup
+    Cold start, each run in a fresh interpreter: the time to import
+    arcanascheduler, and the time from spawning the interpreter (clock read
+    in the parent just before) to the main window's first paint on a
+    scratch database of each size, interpreter start-up included. Also
+    lists any optional dependency the import pulled in (there should be
+    none). The first-paint column needs a display and is skipped without
+    one.
+"""
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from arcanascheduler import ArcanaeumDB
+
+
+# -----------------------------
+#         HELPERS
+# -----------------------------
+def build_db(path, n_tasks):
+    """Creates a scratch DB at `path` holding `n_tasks` synthetic tasks."""
+    db = ArcanaeumDB(path)
+    categories = ('Work', 'Personal', 'Study', 'General')
+    priorities = ('Low', 'Medium', 'High', 'Critical')
+    statuses = ('Pending', 'Completed', 'Behind', 'Ahead')
+    db.add_tasks_bulk({
+        'title': f"Task {i}",
+        'description': f"Synthetic task number {i}",
+        'date': f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+        'status': statuses[i % 4],
+        'priority': priorities[i % 4],
+        'category': categories[i % 4],
+        'estimated_time': f"{i % 5 + 1}h",
+    } for i in range(n_tasks))
+    return db
+
+
+def time_best(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def retained_bytes(fn):
+    """Memory still referenced by fn()'s return value once it has been built."""
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+# -----------------------------
+#         BENCHMARKS
+# -----------------------------
+def bench_rows(sizes, repeat=3):
+    print(f"{'rows':>9}  {'repr':<8} {'load s':>8} {'MiB':>9} {'bytes/row':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            db = build_db(os.path.join(tmp, f"rows_{n}.db"), n)
+            loaders = (
+                ('dict', lambda: db.get_tasks()),
+                ('compact', lambda: db.get_tasks(compact=True)),
+            )
+            for name, load in loaders:
+                seconds = time_best(load, repeat)
+                size = retained_bytes(load)
+                print(f"{n:>9}  {name:<8} {seconds:>8.3f} {size / 2**20:>9.1f} {size / n:>10.0f}")
+            db.close()
+
+
+# Run in a child interpreter: argv[1] is the parent's time.time() just before
+# spawning it, argv[2] a DB path, or absent to time the import alone.
+# Prints "<import s> <first paint s or -> <optional modules loaded or ->".
+STARTUP_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import arcanascheduler
+imported = time.perf_counter() - start
+loaded = [m for m in ('matplotlib', 'icalendar', 'plyer') if m in sys.modules]
+painted = '-'
+if len(sys.argv) > 2:
+    app = arcanascheduler.Arcanaeum(db_file=sys.argv[2])
+    app.update()
+    painted = f'{time.time() - float(sys.argv[1]):.3f}'
+    app.on_close()
+print(f"{imported:.3f} {painted} {','.join(loaded) or '-'}")
+"""
+
+
+def has_display():
+    import tkinter
+    try:
+        tkinter.Tk().destroy()
+    except tkinter.TclError:
+        return False
+    return True
+
+
+def run_startup(db_path=None):
+    args = [sys.executable, '-c', STARTUP_SCRIPT, repr(time.time())] + ([db_path] if db_path else [])
+    out = subprocess.run(args, check=True, capture_output=True, text=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    imported, painted, loaded = out.split()
+    return float(imported), None if painted == '-' else float(painted), loaded
+
+
+def bench_startup(sizes, repeat=3):
+    display = has_display()
+    print(f"{'tasks':>9} {'import s':>9} {'paint s':>9}  optional modules imported")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            db_path = None
+            if display:
+                db_path = os.path.join(tmp, f"startup_{n}.db")
+                build_db(db_path, n).close()
+            runs = [run_startup(db_path) for _ in range(repeat)]
+            imported = min(r[0] for r in runs)
+            painted = f"{min(r[1] for r in runs):>9.3f}" if display else f"{'skipped':>9}"
+            print(f"{n:>9} {imported:>9.3f} {painted}  {runs[0][2]}")
+            if not display:
+                print("(no display: first paint not measured)")
+                break
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Arcanaeum benchmarks")
+    sub = parser.add_subparsers(dest='bench', required=True)
+
+    rows = sub.add_parser('rows', help="dict vs compact task rows")
+    rows.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    rows.add_argument('--repeat', type=int, default=3)
+
+    startup = sub.add_parser('startup', help="import time and time to first paint")
+    startup.add_argument('--sizes', type=int, nargs='+', default=[0, 10000, 100000])
+    startup.add_argument('--repeat', type=int, default=3)
+
+    args = parser.parse_args(argv)
+    if args.bench == 'rows':
+        bench_rows(args.sizes, args.repeat)
+    elif args.bench == 'startup':
+        bench_startup(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()